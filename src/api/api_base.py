@@ -1,8 +1,11 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.api_fetch_okex import router as fetch_router
 from api.api_config import router as config_router
 from api.api_technical_indicators import router as technical_router
+from config.settings import config
 
 # Create FastAPI application
 app = FastAPI(
@@ -25,6 +28,26 @@ app.include_router(fetch_router)
 app.include_router(config_router)
 app.include_router(technical_router)
 
+# Scheduled prediction task runs on the Uvicorn event loop instead of a
+# dedicated thread, avoiding GIL contention with request handlers
+@app.on_event("startup")
+async def _start_scheduler():
+    if config.SCHEDULE_ENABLED:
+        from schedule.prediction_scheduler import prediction_scheduler
+        app.state.scheduler_task = asyncio.create_task(prediction_scheduler.run_async())
+
+
+@app.on_event("shutdown")
+async def _stop_scheduler():
+    task = getattr(app.state, 'scheduler_task', None)
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
 # Root endpoint
 @app.get("/")
 def read_root():
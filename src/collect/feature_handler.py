@@ -11,6 +11,13 @@ from config.settings import config
 from .mongodb_base import MongoDBBaseHandler
 from feature.feature_types import Feature
 
+# pymongoarrow 可选：装了就能把特征按列批量读成 Arrow 表，省掉逐条 dict 物化
+try:
+    from pymongoarrow.api import find_arrow_all
+    PYMONGOARROW_AVAILABLE = True
+except ImportError:
+    PYMONGOARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 class FeatureDataHandler(MongoDBBaseHandler):
@@ -108,6 +115,45 @@ class FeatureDataHandler(MongoDBBaseHandler):
             logger.error(f"Failed to retrieve features: {e}")
             return []
     
+    def get_features_arrow(self, limit: int = 1000, inst_id: str = None, bar: str = None):
+        """
+        Retrieve feature data as a columnar Arrow table.
+        按列直接从 BSON 解码，绕开逐条记录的 Python dict 构建
+
+        Args:
+            limit: Maximum number of records to retrieve
+            inst_id: Instrument ID to filter by
+            bar: Time interval to filter by
+
+        Returns:
+            pyarrow.Table, or None when pymongoarrow is unavailable or the query fails
+        """
+        if not PYMONGOARROW_AVAILABLE:
+            return None
+        try:
+            collection = self._get_collection()
+            if collection is None:
+                return None
+
+            query = {}
+            if inst_id:
+                query["inst_id"] = inst_id
+            if bar:
+                query["bar"] = bar
+
+            table = find_arrow_all(
+                collection, query,
+                projection={'_id': False},
+                sort=[("timestamp", -1)],
+                limit=limit
+            )
+            logger.info(f"Retrieved {table.num_rows} feature records as Arrow table")
+            return table
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve features as Arrow table: {e}")
+            return None
+
     def get_feature(self, inst_id: str, timestamp: int, as_model: bool = False) -> Optional[Union[Dict[str, Any], Feature]]:
         """
         Get a single feature by inst_id and timestamp.
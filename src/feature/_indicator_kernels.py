@@ -0,0 +1,96 @@
+"""
+JIT kernels for last-value indicator recurrences
+The window indicators only need the final scalar(s), so these loops skip the
+pandas Series machinery and compute the recurrence directly on numpy arrays.
+Formulas and edge cases mirror the utils calculators.
+"""
+
+import numpy as np
+
+from utils._njit import njit
+
+
+@njit(cache=True)
+def rsi_last(close: np.ndarray, window: int) -> float:
+    """RSI 最后一个值，等价于 RSICalculator 的 rolling(min_periods=1) 公式"""
+    n = close.shape[0]
+    if n < 2:
+        return np.nan
+
+    cnt = min(window, n)
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for i in range(max(1, n - window), n):
+        delta = close[i] - close[i-1]
+        if delta > 0.0:
+            gain_sum += delta
+        elif delta < 0.0:
+            loss_sum -= delta
+
+    avg_gain = gain_sum / cnt
+    avg_loss = loss_sum / cnt
+    if avg_loss == 0.0:
+        avg_loss = 1.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True)
+def macd_last(close: np.ndarray, fast: int, slow: int, signal: int):
+    """三条 EMA 递推一次遍历完成，等价于 ewm(span=..., adjust=False)"""
+    n = close.shape[0]
+    if n == 0:
+        return np.nan, np.nan, np.nan
+
+    alpha_fast = 2.0 / (fast + 1.0)
+    alpha_slow = 2.0 / (slow + 1.0)
+    alpha_signal = 2.0 / (signal + 1.0)
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    macd_line = 0.0
+    signal_line = 0.0
+
+    for i in range(1, n):
+        ema_fast += alpha_fast * (close[i] - ema_fast)
+        ema_slow += alpha_slow * (close[i] - ema_slow)
+        macd_line = ema_fast - ema_slow
+        signal_line += alpha_signal * (macd_line - signal_line)
+
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@njit(cache=True)
+def bb_last(close: np.ndarray, window: int, num_std: float):
+    """布林带最后一组值，滚动均值/标准差只在窗口尾部累加一次"""
+    n = close.shape[0]
+    if n == 0:
+        return np.nan, np.nan, np.nan
+
+    cnt = min(window, n)
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n - cnt, n):
+        v = close[i]
+        total += v
+        total_sq += v * v
+
+    mean = total / cnt
+    if cnt < 2:
+        std = np.nan
+    else:
+        var = (total_sq - total * total / cnt) / (cnt - 1)
+        std = np.sqrt(var) if var > 0.0 else 0.0
+
+    upper = mean + num_std * std
+    lower = mean - num_std * std
+    width = upper - lower
+    if width == 0.0:
+        width = 1.0
+
+    position = (close[n-1] - lower) / width
+    if position < 0.0:
+        position = 0.0
+    elif position > 1.0:
+        position = 1.0
+
+    return upper, lower, position
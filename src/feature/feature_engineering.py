@@ -0,0 +1,860 @@
+"""
+Feature engineering module
+Builds sliding-window training datasets and prediction features from
+candlestick data, assembling the technical indicator calculators in utils.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config.settings import config
+from feature._indicator_kernels import rsi_last, macd_last, bb_last
+from utils._njit import njit, prange
+
+# bottleneck 的 move_* 滚动核（C 实现、释放 GIL）比逐窗归约快一个量级，
+# 未安装时回退 sliding_window_view 路径
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    bn = None
+    BOTTLENECK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _make_fill_kernel(stride: int, window: int, raw: int, horizon: int, n_windows: int):
+    """
+    按编译期常量特化的样本装配核工厂
+
+    stride/window/raw/horizon/n_windows 在一次训练内不变，作为闭包字面量
+    交给 numba：内层定长循环可展开、边界检查可消除（部分求值/特化）。
+    闭包不支持 cache=True，用 _fill_kernel_cache 按参数组合复用编译结果。
+    """
+
+    @njit(parallel=True)
+    def _fill(raw_cols, price_cols, precomputed, stats_cols, change_cols,
+              edges, label_tbl, lower, upper, out, labels):
+        # 并行装配样本矩阵
+        # 每行样本互相独立，prange 按行切分到多核；列布局与 _feature_names 一致
+        # precomputed 形状为 (样本数, n_windows * n_keys)
+        n_keys = precomputed.shape[1] // n_windows
+        raw_offset = 4 + n_windows * n_keys
+        series_offset = raw_offset + raw * 4
+        for s in prange(out.shape[0]):
+            start = s * stride
+            end = start + window
+            i = end - 1
+
+            for k in range(4):
+                out[s, k] = price_cols[i, k]
+            # 窗口指标已按 (样本, 窗口) 逐一算好，整块拷贝
+            for k in range(n_windows * n_keys):
+                out[s, 4 + k] = precomputed[s, k]
+            # 原始 K 线块按「距当前 t 小时」倒序展开
+            for t in range(raw):
+                base = raw_offset + t * 4
+                row = end - 1 - t
+                for k in range(4):
+                    out[s, base + k] = raw_cols[row, k]
+            j = end - raw
+            for k in range(8):
+                out[s, series_offset + k] = stats_cols[j, k]
+            out[s, series_offset + 8] = change_cols[j - 1, 0]
+            out[s, series_offset + 9] = change_cols[j - 1, 1]
+
+            future_return = (raw_cols[end + horizon - 1, 0] / raw_cols[i, 0] - 1.0) * 100.0
+            if future_return <= lower or future_return > upper:
+                labels[s] = 3
+            else:
+                idx = np.searchsorted(edges, future_return, side='left') - 1
+                if idx < 0:
+                    idx = 0
+                labels[s] = label_tbl[idx]
+
+    return _fill
+
+
+@njit(parallel=True, cache=True)
+def _sample_window_indicators(close: np.ndarray, ends: np.ndarray,
+                              wsizes: np.ndarray, out: np.ndarray) -> None:
+    """
+    按 (样本, 窗口) 计算窗口指标块
+
+    逐样本在每个时间窗口的尾部切片上调用与预测路径完全相同的
+    rsi_last/macd_last/bb_last 递推核（以及 PricePosition/Volatility 的
+    等价标量形式），保证训练特征与 prepare_prediction_features 数值一致：
+    EMA 类指标以各窗口起点为种子，不能用全序列一次递推代替。
+    out 形状为 (样本数, len(wsizes) * 9)，列序与 INDICATOR_KEYS 一致。
+    """
+    n_keys = 9
+    for s in prange(ends.shape[0]):
+        e = ends[s]
+        for w in range(wsizes.shape[0]):
+            lo = e - wsizes[w]
+            if lo < 0:
+                lo = 0
+            seg = close[lo:e]
+            m = seg.shape[0]
+            base = w * n_keys
+
+            # 与 _calculate_window_indicators 一致：数据不足 2 条全置 NaN
+            if m < 2:
+                for k in range(n_keys):
+                    out[s, base + k] = np.nan
+                continue
+
+            out[s, base] = rsi_last(seg, 14)
+            macd_line, macd_signal, macd_histogram = macd_last(seg, 12, 26, 9)
+            out[s, base + 1] = macd_line
+            out[s, base + 2] = macd_signal
+            out[s, base + 3] = macd_histogram
+            bb_upper, bb_lower, bb_position = bb_last(seg, 20, 2.0)
+            out[s, base + 4] = bb_upper
+            out[s, base + 5] = bb_lower
+            out[s, base + 6] = bb_position
+
+            # PricePositionIndicator(20)：末值相对窗口尾部均线的位置
+            pw = 20 if m >= 20 else m
+            total = 0.0
+            for i in range(m - pw, m):
+                total += seg[i]
+            mean_tail = total / pw
+            out[s, base + 7] = seg[m - 1] / mean_tail if mean_tail != 0.0 else np.nan
+
+            # VolatilityIndicator(24)：末尾 24 个收益率的年化波动率（ddof=1）
+            vn = 25 if m >= 25 else m
+            if vn < 3:
+                out[s, base + 8] = np.nan
+            else:
+                off = m - vn
+                mean_ret = 0.0
+                for i in range(off + 1, m):
+                    mean_ret += seg[i] / seg[i - 1] - 1.0
+                n_ret = vn - 1
+                mean_ret /= n_ret
+                acc = 0.0
+                for i in range(off + 1, m):
+                    d = seg[i] / seg[i - 1] - 1.0 - mean_ret
+                    acc += d * d
+                out[s, base + 8] = np.sqrt(acc / (n_ret - 1)) * np.sqrt(252.0)
+
+
+_fill_kernel_cache: Dict[Tuple[int, int, int, int, int], Any] = {}
+
+
+def _get_fill_kernel(stride: int, window: int, raw: int, horizon: int, n_windows: int):
+    """取（或编译）对应常量组合的特化装配核"""
+    key = (stride, window, raw, horizon, n_windows)
+    fn = _fill_kernel_cache.get(key)
+    if fn is None:
+        fn = _make_fill_kernel(stride, window, raw, horizon, n_windows)
+        _fill_kernel_cache[key] = fn
+    return fn
+
+
+def _safe(x) -> float:
+    """NaN 快速检查：NaN != NaN，避免逐值的 np.isnan ufunc 派发与 float() 装箱"""
+    return x if x == x else float('nan')
+
+
+@dataclass(slots=True)
+class IndicatorResult:
+    """单个指标在一个窗口上的计算结果"""
+    name: str
+    values: Dict[str, float]
+
+
+@dataclass(slots=True)
+class CandleArrays:
+    """
+    K 线数据的 SoA (struct-of-arrays) 表示
+    指标计算直接在 numpy 数组上进行，绕开 DataFrame 的列访问开销
+    """
+    timestamp: Optional[np.ndarray] = None
+    open: Optional[np.ndarray] = None
+    high: Optional[np.ndarray] = None
+    low: Optional[np.ndarray] = None
+    close: Optional[np.ndarray] = None
+    volume: Optional[np.ndarray] = None
+
+    COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'CandleArrays':
+        """从 DataFrame 提取可用列为 numpy 数组"""
+        return cls(**{col: df[col].to_numpy() for col in cls.COLUMNS if col in df.columns})
+
+    def available_columns(self) -> frozenset:
+        return frozenset(col for col in self.COLUMNS if getattr(self, col) is not None)
+
+    def tail(self, n: int) -> 'CandleArrays':
+        """取末尾 n 条数据的视图（不复制）"""
+        return CandleArrays(**{
+            col: getattr(self, col)[-n:]
+            for col in self.COLUMNS if getattr(self, col) is not None
+        })
+
+    def head(self, n: int) -> 'CandleArrays':
+        """取开头 n 条数据的视图（不复制）"""
+        return CandleArrays(**{
+            col: getattr(self, col)[:n]
+            for col in self.COLUMNS if getattr(self, col) is not None
+        })
+
+    def __len__(self) -> int:
+        return 0 if self.close is None else len(self.close)
+
+
+class TechnicalIndicator(ABC):
+    """
+    技术指标基类
+    约定统一的窗口计算接口，输出展开为 {key: value} 字典
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # required_columns 是静态的，初始化时固化为 frozenset 供校验复用
+        self._required_set = frozenset(self.required_columns)
+
+    @property
+    @abstractmethod
+    def required_columns(self) -> List[str]:
+        """计算该指标所需的 CandleArrays 字段"""
+
+    @property
+    @abstractmethod
+    def output_keys(self) -> List[str]:
+        """calculate 输出字典的键名，用于数据不足/异常时的 NaN 占位"""
+
+    @abstractmethod
+    def calculate(self, arrays: CandleArrays) -> IndicatorResult:
+        """在给定窗口数据上计算指标"""
+
+
+class RSIIndicator(TechnicalIndicator):
+    """RSI 指标，JIT 递推核只算最后一个值"""
+
+    def __init__(self, window: int = 14):
+        super().__init__(f'rsi_{window}')
+        self.window = window
+
+    @property
+    def required_columns(self) -> List[str]:
+        return ['close']
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ['rsi']
+
+    def calculate(self, arrays: CandleArrays) -> IndicatorResult:
+        value = rsi_last(np.asarray(arrays.close, dtype=np.float64), self.window)
+        return IndicatorResult(name=self.name, values={'rsi': _safe(value)})
+
+
+class MACDIndicator(TechnicalIndicator):
+    """MACD 指标，三条 EMA 递推在 JIT 核中一次完成"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__('macd')
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+
+    @property
+    def required_columns(self) -> List[str]:
+        return ['close']
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ['macd_line', 'macd_signal', 'macd_histogram']
+
+    def calculate(self, arrays: CandleArrays) -> IndicatorResult:
+        macd_line, macd_signal, macd_histogram = macd_last(
+            np.asarray(arrays.close, dtype=np.float64), self.fast, self.slow, self.signal)
+        return IndicatorResult(name=self.name, values={
+            'macd_line': _safe(macd_line),
+            'macd_signal': _safe(macd_signal),
+            'macd_histogram': _safe(macd_histogram),
+        })
+
+
+class BollingerBandsIndicator(TechnicalIndicator):
+    """布林带指标，JIT 核在窗口尾部单趟累加均值/标准差"""
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        super().__init__(f'bb_{window}')
+        self.window = window
+        self.num_std = num_std
+
+    @property
+    def required_columns(self) -> List[str]:
+        return ['close']
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ['bb_upper', 'bb_lower', 'bb_position']
+
+    def calculate(self, arrays: CandleArrays) -> IndicatorResult:
+        upper, lower, position = bb_last(
+            np.asarray(arrays.close, dtype=np.float64), self.window, self.num_std)
+        return IndicatorResult(name=self.name, values={
+            'bb_upper': _safe(upper),
+            'bb_lower': _safe(lower),
+            'bb_position': _safe(position),
+        })
+
+
+class PricePositionIndicator(TechnicalIndicator):
+    """价格相对均线位置"""
+
+    def __init__(self, window: int = 20):
+        super().__init__(f'price_position_{window}')
+        self.window = window
+
+    @property
+    def required_columns(self) -> List[str]:
+        return ['close']
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ['price_position']
+
+    def calculate(self, arrays: CandleArrays) -> IndicatorResult:
+        window_mean = arrays.close[-self.window:].mean()
+        position = arrays.close[-1] / window_mean if window_mean else np.nan
+        return IndicatorResult(name=self.name, values={'price_position': _safe(position)})
+
+
+class VolatilityIndicator(TechnicalIndicator):
+    """年化收益率波动率"""
+
+    def __init__(self, window: int = 24):
+        super().__init__(f'volatility_{window}')
+        self.window = window
+
+    @property
+    def required_columns(self) -> List[str]:
+        return ['close']
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ['volatility']
+
+    def calculate(self, arrays: CandleArrays) -> IndicatorResult:
+        # 只需末尾 window 个收益率，np.diff 直接在数组上算，不经过 Series
+        arr = arrays.close[-(self.window + 1):]
+        if arr.size < 3:
+            volatility = np.nan
+        else:
+            returns = np.diff(arr) / arr[:-1]
+            volatility = returns.std(ddof=1) * np.sqrt(252)
+        return IndicatorResult(name=self.name, values={'volatility': _safe(volatility)})
+
+
+class IndicatorRegistry:
+    """
+    指标注册表
+    按名称注册指标类，供配置化创建实例
+    """
+
+    __slots__ = ('_indicators',)
+
+    def __init__(self):
+        self._indicators: Dict[str, type] = {}
+
+    def register(self, name: str, indicator_cls: type) -> None:
+        self._indicators[name] = indicator_cls
+
+    def create_instance(self, name: str, **kwargs) -> TechnicalIndicator:
+        try:
+            indicator_cls = self._indicators[name]
+        except KeyError:
+            raise ValueError(f"Indicator '{name}' not registered") from None
+        return indicator_cls(**kwargs)
+
+    def names(self) -> List[str]:
+        return list(self._indicators.keys())
+
+
+indicator_registry = IndicatorRegistry()
+indicator_registry.register('rsi', RSIIndicator)
+indicator_registry.register('macd', MACDIndicator)
+indicator_registry.register('bollinger_bands', BollingerBandsIndicator)
+indicator_registry.register('price_position', PricePositionIndicator)
+indicator_registry.register('volatility', VolatilityIndicator)
+
+
+class TechnicalIndicatorsCalculator:
+    """
+    多时间窗口指标计算器
+    按 config.TIME_WINDOWS 在各窗口上运行全部指标
+    """
+
+    def __init__(self):
+        self.windows = config.TIME_WINDOWS
+        self.indicators: List[TechnicalIndicator] = [
+            indicator_registry.create_instance('rsi'),
+            indicator_registry.create_instance('macd'),
+            indicator_registry.create_instance('bollinger_bands'),
+            indicator_registry.create_instance('price_position'),
+            indicator_registry.create_instance('volatility'),
+        ]
+        # 最终特征名由 指标集 × 窗口名 确定，初始化时一次格式化好
+        # 避免每次计算为每个输出键重复 f-string 拼接
+        self._window_key_names: Dict[str, Dict[str, str]] = {
+            window_name: {
+                key: f'{window_name}_{key}'
+                for indicator in self.indicators
+                for key in indicator.output_keys
+            }
+            for window_name in self.windows
+        }
+
+    def calculate_indicators(self, df: pd.DataFrame, _assume_sorted: bool = False) -> Dict[str, float]:
+        """
+        在各时间窗口上计算全部指标
+
+        Args:
+            df: 按 timestamp 升序的 K 线数据
+            _assume_sorted: 调用方保证已按 timestamp 升序时跳过排序检查
+
+        Returns:
+            {f'{window_name}_{key}': value} 展平的指标字典
+        """
+        if not _assume_sorted and not df['timestamp'].is_monotonic_increasing:
+            df = df.sort_values('timestamp').reset_index(drop=True)
+        arrays = CandleArrays.from_dataframe(df)
+
+        indicators: Dict[str, float] = {}
+        for window_name, window_size in self.windows.items():
+            window_arrays = arrays.tail(window_size)
+            indicators.update(self._calculate_window_indicators(window_arrays, window_name))
+        return indicators
+
+    def _calculate_window_indicators(self, arrays: CandleArrays, window_name: str) -> Dict[str, float]:
+        """在单个窗口上运行全部指标，异常或数据不足时用 NaN 占位"""
+        indicators: Dict[str, float] = {}
+        # 可用列在整个循环内不变，frozenset 只构建一次
+        available = arrays.available_columns()
+        key_names = self._window_key_names[window_name]
+        for indicator in self.indicators:
+            missing = indicator._required_set - available
+            if missing:
+                logger.warning(f"窗口 {window_name} 缺少列 {missing}，跳过指标 {indicator.name}")
+                continue
+
+            if len(arrays) < 2:
+                for key in indicator.output_keys:
+                    indicators[key_names[key]] = np.nan
+                continue
+
+            try:
+                result = indicator.calculate(arrays)
+                for key, value in result.values.items():
+                    indicators[key_names[key]] = value
+            except Exception as e:
+                logger.warning(f"指标 {indicator.name} 在窗口 {window_name} 计算失败: {e}")
+                for key in indicator.output_keys:
+                    indicators[key_names[key]] = np.nan
+        return indicators
+
+
+class IncrementalIndicatorCache:
+    """
+    预测特征的流式缓存
+    实时场景下 prepare_prediction_features 在同一根 K 线内会被反复调用
+    （调度间隔远小于 K 线周期），同一快照只算一次；
+    各窗口 EMA 以滑动窗口起点为种子，逐点递推会改变数值，
+    因此缓存粒度为快照 (数据长度, 末尾 timestamp, 末尾 close, 末尾 volume)
+    而非单点增量：未收盘 K 线的 timestamp 不变但价量会持续跳动
+    """
+
+    __slots__ = ('_key', '_features')
+
+    def __init__(self):
+        self._key: Optional[Tuple[int, int, float, float]] = None
+        self._features: Optional[Dict[str, float]] = None
+
+    def get(self, key: Tuple[int, int, float, float]) -> Optional[Dict[str, float]]:
+        if key == self._key:
+            return self._features
+        return None
+
+    def store(self, key: Tuple[int, int, float, float], features: Dict[str, float]) -> None:
+        self._key = key
+        self._features = features
+
+
+class LabelGenerator:
+    """根据未来收益率生成分类标签"""
+
+    def __init__(self, thresholds: Optional[Dict[int, Tuple[float, float]]] = None):
+        self.thresholds = thresholds or config.CLASSIFICATION_THRESHOLDS
+        self.class_labels = config.CLASSIFICATION_THRESHOLDS_DESC
+        # 阈值按下界排序后固化为数组，批量分类走一次 searchsorted
+        items = sorted(self.thresholds.items(), key=lambda kv: kv[1][0])
+        self._bin_edges = np.array([bounds[0] for _, bounds in items])
+        self._bin_labels = np.array([label for label, _ in items], dtype=np.int8)
+        self._lower_bound = items[0][1][0]
+        self._upper_bound = items[-1][1][1]
+
+    def generate_labels(self, df: pd.DataFrame, prediction_horizon: int = 24) -> pd.DataFrame:
+        """
+        为每一行生成 prediction_horizon 小时后的收益率分类标签
+
+        Args:
+            df: K 线数据
+            prediction_horizon: 预测时长（小时）
+
+        Returns:
+            带 classification_label 列的 DataFrame，末尾无未来数据的行为 None
+        """
+        if not df['timestamp'].is_monotonic_increasing:
+            df = df.sort_values('timestamp').reset_index(drop=True)
+
+        close = df['close'].to_numpy(dtype=np.float64)
+        future_return = np.full(len(close), np.nan)
+        if prediction_horizon < len(close):
+            future_return[:-prediction_horizon] = (close[prediction_horizon:] / close[:-prediction_horizon] - 1) * 100
+
+        df['classification_label'] = self._classify_return_batch(future_return)
+        return df
+
+    def _classify_return_batch(self, returns: np.ndarray) -> np.ndarray:
+        """
+        批量收益率(%)分类
+        一次 searchsorted 替代逐元素的阈值扫描，NaN 保持为 NaN
+        """
+        idx = np.searchsorted(self._bin_edges, returns, side='left') - 1
+        idx = np.clip(idx, 0, len(self._bin_labels) - 1)
+        labels = self._bin_labels[idx].astype(np.float64)
+        # 与标量版 fallback 一致：超出阈值范围归为横盘
+        with np.errstate(invalid='ignore'):
+            labels[(returns <= self._lower_bound) | (returns > self._upper_bound)] = 3
+        labels[np.isnan(returns)] = np.nan
+        return labels
+
+    def _classify_return(self, return_pct: float) -> int:
+        """收益率(%)映射到分类标签，标量版同样走 searchsorted bins"""
+        if return_pct <= self._lower_bound or return_pct > self._upper_bound:
+            return 3  # 超出阈值范围时归为横盘
+        idx = np.searchsorted(self._bin_edges, return_pct, side='left') - 1
+        return int(self._bin_labels[max(idx, 0)])
+
+    def get_label_distribution(self, labels: List[Optional[int]]) -> Dict[str, int]:
+        """统计各标签的样本数量"""
+        arr = np.asarray(labels, dtype=np.float64)
+        arr = arr[arr == arr]  # 过滤 None/NaN
+        if arr.size == 0:
+            return {}
+        # 标签是小的非负整数，C 级直方图替代 Counter 的逐元素哈希
+        counts = np.bincount(arr.astype(np.intp))
+        return {
+            self.class_labels.get(label, str(label)): int(count)
+            for label, count in enumerate(counts) if count > 0
+        }
+
+
+class FeatureDatasetBuilder:
+    """
+    滑动窗口特征数据集构建器
+    把 K 线历史切成 (特征, 标签) 样本，供 xgboost_trainer 使用
+    """
+
+    RAW_WINDOW = 24
+
+    # _sample_window_indicators 输出的指标列，与各 Indicator 的输出键一一对应
+    INDICATOR_KEYS = ('rsi', 'macd_line', 'macd_signal', 'macd_histogram',
+                      'bb_upper', 'bb_lower', 'bb_position',
+                      'price_position', 'volatility')
+
+    # _extract_raw_price_series 输出的统计特征键名
+    SERIES_KEYS = ('raw_price_mean', 'raw_price_std', 'raw_price_min', 'raw_price_max',
+                   'raw_price_range_mean', 'raw_price_range_max',
+                   'raw_volume_mean', 'raw_volume_std',
+                   'raw_price_change_mean', 'raw_price_change_std')
+
+    def __init__(self):
+        self.feature_window_size = config.FEATURE_WINDOW_SIZE
+        self.tech_calculator = tech_calculator
+        self.label_generator = LabelGenerator()
+        # 原始价格特征键名固定，提前构建好按 (时偏移, 列) 展平的顺序
+        self._raw_keys = [
+            f'raw_{col}_{i+1}h'
+            for i in range(self.RAW_WINDOW)
+            for col in ('close', 'high', 'low', 'volume')
+        ]
+        # 训练特征矩阵的固定列顺序：价格特征 + 各窗口指标 + 原始块 + 序列统计
+        self._feature_names = (
+            ['current_price', 'price_volatility', 'volume_avg', 'price_trend_24h']
+            + [f'{window_name}_{key}'
+               for window_name in self.tech_calculator.windows
+               for key in self.INDICATOR_KEYS]
+            + self._raw_keys
+            + list(self.SERIES_KEYS)
+        )
+        self._prediction_cache = IncrementalIndicatorCache()
+
+    def create_training_dataset(self,
+                                candlestick_data: List[Dict[str, Any]],
+                                stride: int = 10,
+                                prediction_horizon: int = 24) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        用滑动窗口从 K 线历史构建训练数据集
+
+        Args:
+            candlestick_data: K 线记录列表
+            stride: 相邻样本的窗口步长
+            prediction_horizon: 预测时长（小时）
+
+        Returns:
+            (特征 DataFrame, 标签 Series)
+        """
+        df = pd.DataFrame(candlestick_data)
+        if df.empty or len(df) < self.feature_window_size + prediction_horizon:
+            logger.error("数据不足，无法构建训练数据集")
+            return pd.DataFrame(), pd.Series(dtype=int)
+
+        # 只在必要时排序一次，下游全部按已排序处理
+        if not df['timestamp'].is_monotonic_increasing:
+            df = df.sort_values('timestamp').reset_index(drop=True)
+        n_windows = len(self.tech_calculator.windows)
+
+        # 价格特征的滚动统计同样只算一次（窗口间高度重叠）
+        close_series = df['close']
+        # 特征矩阵统一使用 FP32：下游 XGBoost/sklearn 原生支持，内存带宽减半
+        close_arr = close_series.to_numpy(dtype=np.float32)
+        high_arr = df['high'].to_numpy(dtype=np.float32)
+        low_arr = df['low'].to_numpy(dtype=np.float32)
+        volume_arr = df['volume'].to_numpy(dtype=np.float32)
+        close_mean24 = close_series.rolling(self.RAW_WINDOW, min_periods=1).mean().to_numpy()
+        close_std24 = close_series.rolling(self.RAW_WINDOW, min_periods=1).std().to_numpy()
+        volume_mean24 = df['volume'].rolling(self.RAW_WINDOW, min_periods=1).mean().to_numpy()
+        trend24 = (close_series.pct_change(self.RAW_WINDOW) * 100).to_numpy()
+
+        window = self.feature_window_size
+        raw = self.RAW_WINDOW
+        range_arr = high_arr - low_arr
+        change_arr = np.diff(close_arr)
+        if BOTTLENECK_AVAILABLE:
+            # move_* 单趟滑动核：min_count=raw 等价整窗归约，前 raw-1 个 NaN 切掉
+            close_mean_r = bn.move_mean(close_arr, raw, min_count=raw)[raw - 1:]
+            close_std_r = bn.move_std(close_arr, raw, min_count=raw, ddof=1)[raw - 1:]
+            close_min_r = bn.move_min(close_arr, raw, min_count=raw)[raw - 1:]
+            close_max_r = bn.move_max(close_arr, raw, min_count=raw)[raw - 1:]
+            range_mean_r = bn.move_mean(range_arr, raw, min_count=raw)[raw - 1:]
+            range_max_r = bn.move_max(range_arr, raw, min_count=raw)[raw - 1:]
+            volume_mean_r = bn.move_mean(volume_arr, raw, min_count=raw)[raw - 1:]
+            volume_std_r = bn.move_std(volume_arr, raw, min_count=raw, ddof=1)[raw - 1:]
+            change_mean_r = bn.move_mean(change_arr, raw, min_count=raw)[raw - 1:]
+            change_std_r = bn.move_std(change_arr, raw, min_count=raw, ddof=1)[raw - 1:]
+        else:
+            # 回退路径：sliding_window_view 零拷贝二维视图 + 每种归约一趟 C 循环
+            swv_close = sliding_window_view(close_arr, raw)
+            swv_range = sliding_window_view(range_arr, raw)
+            swv_volume = sliding_window_view(volume_arr, raw)
+            swv_change = sliding_window_view(change_arr, raw)
+            close_mean_r = swv_close.mean(axis=1)
+            close_std_r = swv_close.std(axis=1, ddof=1)
+            close_min_r = swv_close.min(axis=1)
+            close_max_r = swv_close.max(axis=1)
+            range_mean_r = swv_range.mean(axis=1)
+            range_max_r = swv_range.max(axis=1)
+            volume_mean_r = swv_volume.mean(axis=1)
+            volume_std_r = swv_volume.std(axis=1, ddof=1)
+            change_mean_r = swv_change.mean(axis=1)
+            change_std_r = swv_change.std(axis=1, ddof=1)
+
+        starts = range(0, len(df) - window - prediction_horizon + 1, stride)
+        n_samples = len(starts)
+        if n_samples == 0:
+            return pd.DataFrame(), pd.Series(dtype=int)
+
+        # 窗口指标按 (样本, 窗口) 用与预测路径相同的 JIT 核计算：
+        # EMA/RSI 以窗口起点为种子，全序列一次递推会造成训练/预测数值不一致
+        close64 = np.ascontiguousarray(close_series.to_numpy(dtype=np.float64))
+        ends = np.fromiter((s + window for s in starts), dtype=np.int64, count=n_samples)
+        wsizes = np.asarray(list(self.tech_calculator.windows.values()), dtype=np.int64)
+        precomputed = np.empty((n_samples, n_windows * len(self.INDICATOR_KEYS)))
+        _sample_window_indicators(close64, ends, wsizes, precomputed)
+
+        # 预分配样本矩阵后交给并行 JIT 核按行装配，行间无依赖
+        feat_mat = np.empty((n_samples, len(self._feature_names)), dtype=np.float32)
+        labels = np.empty(n_samples, dtype=np.int8)
+
+        raw_cols = np.ascontiguousarray(
+            np.column_stack((close_arr, high_arr, low_arr, volume_arr)))
+        price_cols = np.ascontiguousarray(np.column_stack((
+            close_arr, close_std24 / close_mean24, volume_mean24, trend24)))
+        stats_cols = np.ascontiguousarray(np.column_stack((
+            close_mean_r, close_std_r, close_min_r, close_max_r,
+            range_mean_r, range_max_r, volume_mean_r, volume_std_r)))
+        change_cols = np.ascontiguousarray(
+            np.column_stack((change_mean_r, change_std_r)))
+
+        lg = self.label_generator
+        # 装配核按 (stride, window, raw, horizon, n_windows) 特化并缓存编译结果
+        fill_kernel = _get_fill_kernel(stride, window, raw, prediction_horizon, n_windows)
+        fill_kernel(raw_cols, price_cols, np.ascontiguousarray(precomputed),
+                    stats_cols, change_cols,
+                    lg._bin_edges, lg._bin_labels,
+                    lg._lower_bound, lg._upper_bound,
+                    feat_mat, labels)
+
+        logger.info(f"构建训练数据集完成, 样本数: {n_samples}")
+        return pd.DataFrame(feat_mat, columns=self._feature_names), pd.Series(labels)
+
+    def create_features_from_data(self,
+                                  current_data: List[Dict[str, Any]],
+                                  future_data: List[Dict[str, Any]],
+                                  prediction_horizon: int = 24) -> Optional[Tuple[Dict[str, float], int]]:
+        """
+        从当前窗口与未来数据直接构建单个 (特征, 标签) 样本
+        """
+        current_df = pd.DataFrame(current_data)
+        future_df = pd.DataFrame(future_data)
+        return self._extract_features(current_df, future_df, prediction_horizon)
+
+    def prepare_prediction_features(self, candlestick_data: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        为预测准备单行特征（无标签）
+
+        Args:
+            candlestick_data: 最近的 K 线记录列表
+
+        Returns:
+            单行特征 DataFrame，数据不足时为空
+        """
+        df = pd.DataFrame(candlestick_data)
+        if df.empty or len(df) < self.feature_window_size:
+            logger.error("数据不足，无法构建预测特征")
+            return pd.DataFrame()
+
+        if not df['timestamp'].is_monotonic_increasing:
+            df = df.sort_values('timestamp').reset_index(drop=True)
+
+        # 同一快照直接复用上次计算结果；末尾 close/volume 参与键值，
+        # 未收盘 K 线同一 timestamp 下的价量更新不会命中陈旧缓存
+        cache_key = (len(df), int(df['timestamp'].iloc[-1]),
+                     float(df['close'].iloc[-1]), float(df['volume'].iloc[-1]))
+        cached = self._prediction_cache.get(cache_key)
+        if cached is not None:
+            return pd.DataFrame([cached])
+
+        window_df = df.tail(self.feature_window_size)
+        features = self.calculate_price_features(window_df, prediction_horizon=0)
+        features.update(self.tech_calculator.calculate_indicators(window_df, _assume_sorted=True))
+        features.update(self._extract_raw_price_features(window_df))
+        self._prediction_cache.store(cache_key, features)
+        return pd.DataFrame([features])
+
+    def _extract_features(self,
+                          current_data: pd.DataFrame,
+                          future_data: pd.DataFrame,
+                          prediction_horizon: int,
+                          precomputed: Optional[Dict[str, float]] = None) -> Optional[Tuple[Dict[str, float], int]]:
+        """
+        在一个窗口上提取特征并计算标签
+        precomputed 给出时直接采用（训练路径的全序列预计算结果），
+        否则在窗口上即时计算价格特征与指标
+        """
+        if len(future_data) < prediction_horizon:
+            return None
+
+        try:
+            # 价格特征只依赖当前窗口，未来数据仅取末尾收盘价做标签，
+            # 无需再拼接 current/future 两个 DataFrame
+            if precomputed is not None:
+                features = dict(precomputed)
+            else:
+                features = self.calculate_price_features(current_data, prediction_horizon=0)
+                features.update(self.tech_calculator.calculate_indicators(current_data))
+            features.update(self._extract_raw_price_features(current_data))
+
+            current_close = float(current_data['close'].iloc[-1])
+            future_close = float(future_data['close'].iloc[-1])
+            future_return = (future_close / current_close - 1) * 100
+            label = self.label_generator._classify_return(future_return)
+        except Exception as e:
+            logger.warning(f"提取特征失败: {e}")
+            return None
+
+        return features, label
+
+    def calculate_price_features(self, df: pd.DataFrame, prediction_horizon: int) -> Dict[str, float]:
+        """
+        基础价格特征
+        df 末尾 prediction_horizon 行视为未来数据，不参与特征计算
+        """
+        current = df.iloc[:-prediction_horizon] if prediction_horizon else df
+        # 一次 to_numpy 后全走标量算术，避免 tail/iloc 反复触碰 Index
+        close = current['close'].to_numpy()
+        tail = close[-self.RAW_WINDOW:]
+
+        current_price = float(close[-1])
+        close_mean = tail.mean()
+        close_std = tail.std(ddof=1)
+        price_volatility = float(close_std / close_mean) if close_mean else np.nan
+        volume_avg = float(current['volume'].to_numpy()[-self.RAW_WINDOW:].mean())
+
+        if close.size > self.RAW_WINDOW:
+            price_trend_24h = float((close[-1] / close[-(self.RAW_WINDOW + 1)] - 1) * 100)
+        else:
+            price_trend_24h = np.nan
+
+        return {
+            'current_price': current_price,
+            'price_volatility': price_volatility,
+            'volume_avg': volume_avg,
+            'price_trend_24h': price_trend_24h,
+        }
+
+    def _extract_raw_price_features(self, window_df: pd.DataFrame) -> Dict[str, float]:
+        """最近 RAW_WINDOW 根 K 线的原始价格特征与统计量"""
+        raw_features: Dict[str, float] = {}
+
+        # 一次性取出尾部块并倒序展平，替代逐元素的 .iloc 标量转换；
+        # 数据不足 RAW_WINDOW 时 zip 自然截断到现有行数
+        block = window_df[['close', 'high', 'low', 'volume']].tail(self.RAW_WINDOW).to_numpy()[::-1].ravel()
+        raw_features.update(zip(self._raw_keys, block.tolist()))
+
+        raw_features.update(self._extract_raw_price_series(window_df))
+        return raw_features
+
+    def _extract_raw_price_series(self, window_df: pd.DataFrame) -> Dict[str, float]:
+        """窗口尾部的序列统计特征"""
+        close_full = window_df['close'].to_numpy()
+        close = close_full[-self.RAW_WINDOW:]
+        volume = window_df['volume'].to_numpy()[-self.RAW_WINDOW:]
+        high = window_df['high'].to_numpy()[-self.RAW_WINDOW:]
+        low = window_df['low'].to_numpy()[-self.RAW_WINDOW:]
+        price_range = high - low
+        # np.diff 天然无 NaN，等价原 diff().dropna().tail(RAW_WINDOW)
+        # 且省去新建 Series/Index 与布尔掩码扫描
+        price_change = np.diff(close_full[-(self.RAW_WINDOW + 1):])
+
+        return {
+            'raw_price_mean': float(close.mean()),
+            'raw_price_std': float(close.std(ddof=1)),
+            'raw_price_min': float(close.min()),
+            'raw_price_max': float(close.max()),
+            'raw_price_range_mean': float(price_range.mean()),
+            'raw_price_range_max': float(price_range.max()),
+            'raw_volume_mean': float(volume.mean()),
+            'raw_volume_std': float(volume.std(ddof=1)),
+            'raw_price_change_mean': float(price_change.mean()),
+            'raw_price_change_std': float(price_change.std(ddof=1)),
+        }
+
+
+# Global instances
+tech_calculator = TechnicalIndicatorsCalculator()
+label_generator = LabelGenerator()
+feature_engineer = FeatureDatasetBuilder()
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 from feature.feature_1h_creator import Feature1HCreator
 from feature.feature_15m_creator import Feature15mCreator
@@ -15,12 +16,19 @@ from collect.async_candlestick_handler import async_candlestick_handler
 
 log = logging.getLogger(__name__)
 
+_get_ts = itemgetter('timestamp')
+
 class FeatureMerge:
     
     def __init__(self, batch_size: int = 1000):
         self.inst_id = "ETH-USDT-SWAP"
         self.batch_size = batch_size
         self._batch_cache: List[Feature] = []
+        # 归一化参数在整个 loop 期间不变，缓存对应的 Creator 实例避免每次迭代重新构造
+        self._creator_cache: Dict[tuple, tuple] = {}
+        # 每个 bar 已验证连续的时间戳区间 (first_ts, last_ts)
+        # loop 逐根回退时窗口几乎全量重叠，只需校验新增部分
+        self._validated_ranges: Dict[str, tuple] = {}
     
     def loop(self, before: int = None, limit: int = 5000) -> bool:
         """
@@ -76,13 +84,13 @@ class FeatureMerge:
         try:
             success = feature_handler.save_features([features])
             if success:
-                print(f"成功保存特征数据，timestamp: {features.timestamp}")
-            
+                log.info("成功保存特征数据, timestamp: %s", features.timestamp)
+
             return features.timestamp
         except Exception as e:
-            print(f"保存特征数据失败: {e}")
+            log.error("保存特征数据失败: %s", e)
             return None
-    
+
     def process(self, before: int = None) -> int:
         """
         合并1小时、15分钟和4小时的特征参数（同步版本）
@@ -105,11 +113,11 @@ class FeatureMerge:
         try:
             success = feature_handler.save_features([features])
             if success:
-                print(f"成功保存特征数据，timestamp: {features.timestamp}")
+                log.info("成功保存特征数据, timestamp: %s", features.timestamp)
             return features.timestamp
         except Exception as e:
-            print(f"保存特征数据失败: {e}")
-            return None      
+            log.error("保存特征数据失败: %s", e)
+            return None
     
     def quick_process_eth(self) -> Optional[Feature]:
         """
@@ -258,23 +266,17 @@ class FeatureMerge:
                 log.warning(f"1H和4H的小时差不在有效范围内, 差值: {hour_diff}, last_1h: {last_1h.get('timestamp')}")
                 return None
             
-            for i in range(47):
-                if candles1H[i+1].get('timestamp') != candles1H[i].get('timestamp') + 60 * 60 * 1000:
-                    log.warning(f"1H数据不连续, 索引: {i}, 时间差: {candles1H[i+1].get('timestamp') - candles1H[i].get('timestamp')}")
-                    return None
-            for i in range(47):
-                if candles15m[i+1].get('timestamp') != candles15m[i].get('timestamp') + 15 * 60 * 1000:
-                    log.warning(f"15m数据不连续, 索引: {i}, 时间差: {candles15m[i+1].get('timestamp') - candles15m[i].get('timestamp')}")
+            for bar_name, candles, step in (
+                ('1H', candles1H, 60 * 60 * 1000),
+                ('15m', candles15m, 15 * 60 * 1000),
+                ('4H', candles4H, 4 * 60 * 60 * 1000),
+                ('1D', candles1D, 24 * 60 * 60 * 1000),
+            ):
+                # 一次性取出全部 timestamp，避免循环内重复的 dict 查找
+                timestamps = list(map(_get_ts, candles))
+                if not self._validate_contiguity(bar_name, timestamps, step):
                     return None
-            for i in range(47):
-                if candles4H[i+1].get('timestamp') != candles4H[i].get('timestamp') + 4 * 60 * 60 * 1000:
-                    log.warning(f"4H数据不连续, 索引: {i}, 时间差: {candles4H[i+1].get('timestamp') - candles4H[i].get('timestamp')}")
-                    return None
-            for i in range(47):
-                if candles1D[i+1].get('timestamp') != candles1D[i].get('timestamp') + 24 * 60 * 60 * 1000:
-                    log.warning(f"1D数据不连续, 索引: {i}, 时间差: {candles1D[i+1].get('timestamp') - candles1D[i].get('timestamp')}")
-                    return None
-                
+
         except (IndexError, KeyError) as e:
             log.warning(f"时间字段校验失败: {e}")
             return None
@@ -285,89 +287,71 @@ class FeatureMerge:
         if not is_close_saved or not is_volume_saved:
             return None
         
-        feature1h = Feature1HCreator(close_mean=is_close_saved['mean'], 
-                                    close_std=is_close_saved['std'], 
-                                    vol_mean=is_volume_saved['mean'], 
-                                    vol_std=is_volume_saved['std'])
-        feature15m = Feature15mCreator()
-        feature4h = Feature4HCreator(close_mean=is_close_saved['mean'], 
-                                    close_std=is_close_saved['std'])
-        feature1D = Feature1DCreator(close_mean=is_close_saved['mean'], 
-                                    close_std=is_close_saved['std'])
+        feature1h, feature15m, feature4h, feature1D = self._get_creators(
+            close_mean=is_close_saved['mean'],
+            close_std=is_close_saved['std'],
+            vol_mean=is_volume_saved['mean'],
+            vol_std=is_volume_saved['std'])
         
         feature1h_result = feature1h.calculate(candles1H)
         feature15m_result = feature15m.calculate(candles15m)
         feature4h_result = feature4h.calculate(candles4H)
         feature1D_result = feature1D.calculate(candles1D)
         
+        # 四个子模型的字段互不重叠，整体 dump 后一次性合并，
+        # 避免逐字段读取再逐个传参
         feature = Feature(
             timestamp=last_1h.get('timestamp'),
             inst_id=self.inst_id,
             bar="1H",
-            close_1h_normalized=feature1h_result.close_1h_normalized,
-            volume_1h_normalized=feature1h_result.volume_1h_normalized,
-            rsi_14_1h=feature1h_result.rsi_14_1h,
-            macd_line_1h=feature1h_result.macd_line_1h,
-            macd_signal_1h=feature1h_result.macd_signal_1h,
-            macd_histogram_1h=feature1h_result.macd_histogram_1h,
-            price=feature1h_result.price,
-            hour_cos=feature1h_result.hour_cos,
-            hour_sin=feature1h_result.hour_sin,
-            day_of_week=feature1h_result.day_of_week,
-            upper_shadow_ratio_1h=feature1h_result.upper_shadow_ratio_1h,
-            lower_shadow_ratio_1h=feature1h_result.lower_shadow_ratio_1h,
-            shadow_imbalance_1h=feature1h_result.shadow_imbalance_1h,
-            body_ratio_1h=feature1h_result.body_ratio_1h,
-            atr_1h=feature1h_result.atr_1h,
-            adx_1h=feature1h_result.adx_1h,
-            plus_di_1h=feature1h_result.plus_di_1h,
-            minus_di_1h=feature1h_result.minus_di_1h,
-            ema_12_1h=feature1h_result.ema_12_1h,
-            ema_26_1h=feature1h_result.ema_26_1h,
-            ema_48_1h=feature1h_result.ema_48_1h,
-            ema_cross_1h_12_26=feature1h_result.ema_cross_1h_12_26,
-            ema_cross_1h_26_48=feature1h_result.ema_cross_1h_26_48,
-            rsi_14_15m=feature15m_result.rsi_14_15m,
-            volume_impulse_15m=feature15m_result.volume_impulse_15m,
-            macd_line_15m=feature15m_result.macd_line_15m,
-            macd_signal_15m=feature15m_result.macd_signal_15m,
-            macd_histogram_15m=feature15m_result.macd_histogram_15m,
-            atr_15m=feature15m_result.atr_15m,
-            stoch_k_15m=feature15m_result.stoch_k_15m,
-            stoch_d_15m=feature15m_result.stoch_d_15m,
-            rsi_14_4h=feature4h_result.rsi_14_4h,
-            trend_continuation_4h=feature4h_result.trend_continuation_4h,
-            macd_line_4h=feature4h_result.macd_line_4h,
-            macd_signal_4h=feature4h_result.macd_signal_4h,
-            macd_histogram_4h=feature4h_result.macd_histogram_4h,
-            atr_4h=feature4h_result.atr_4h,
-            adx_4h=feature4h_result.adx_4h,
-            plus_di_4h=feature4h_result.plus_di_4h,
-            minus_di_4h=feature4h_result.minus_di_4h,
-            ema_12_4h=feature4h_result.ema_12_4h,
-            ema_26_4h=feature4h_result.ema_26_4h,
-            ema_48_4h=feature4h_result.ema_48_4h,
-            ema_cross_4h_12_26=feature4h_result.ema_cross_4h_12_26,
-            ema_cross_4h_26_48=feature4h_result.ema_cross_4h_26_48,
-            upper_shadow_ratio_4h=feature4h_result.upper_shadow_ratio_4h,
-            lower_shadow_ratio_4h=feature4h_result.lower_shadow_ratio_4h,
-            shadow_imbalance_4h=feature4h_result.shadow_imbalance_4h,
-            body_ratio_4h=feature4h_result.body_ratio_4h,
-            rsi_14_1d=feature1D_result.rsi_14_1d,
-            atr_1d=feature1D_result.atr_1d,
-            bollinger_upper_1d=feature1D_result.bollinger_upper_1d,
-            bollinger_lower_1d=feature1D_result.bollinger_lower_1d,
-            bollinger_position_1d=feature1D_result.bollinger_position_1d,
-            upper_shadow_ratio_1d=feature1D_result.upper_shadow_ratio_1d,
-            lower_shadow_ratio_1d=feature1D_result.lower_shadow_ratio_1d,
-            shadow_imbalance_1d=feature1D_result.shadow_imbalance_1d,
-            body_ratio_1d=feature1D_result.body_ratio_1d,
-            macd_line_1d=feature1D_result.macd_line_1d,
-            macd_signal_1d=feature1D_result.macd_signal_1d,
+            **feature1h_result.model_dump(),
+            **feature15m_result.model_dump(),
+            **feature4h_result.model_dump(),
+            **feature1D_result.model_dump(),
         )
-        
+
         return feature
+
     
+    def _validate_contiguity(self, bar_name: str, timestamps: List[int], step: int) -> bool:
+        """
+        校验时间戳序列按 step 连续
+        与上次已验证区间重叠的部分直接跳过，稳态回退时只校验新增的头部
+        """
+        n = len(timestamps) - 1
+        cached = self._validated_ranges.get(bar_name)
+        if (cached is not None
+                and (cached[0] - timestamps[0]) % step == 0
+                and timestamps[0] <= cached[0] <= timestamps[-1] + step
+                and timestamps[-1] <= cached[1]):
+            # 缓存区间覆盖了窗口尾部，只需校验缓存起点之前的部分
+            n = min(n, (cached[0] - timestamps[0]) // step)
+
+        for i in range(n):
+            if timestamps[i+1] != timestamps[i] + step:
+                log.warning(f"{bar_name}数据不连续, 索引: {i}, 时间差: {timestamps[i+1] - timestamps[i]}")
+                return False
+
+        last_ts = cached[1] if cached is not None and n < len(timestamps) - 1 else timestamps[-1]
+        self._validated_ranges[bar_name] = (timestamps[0], last_ts)
+        return True
+
+    def _get_creators(self, close_mean: float, close_std: float, vol_mean: float, vol_std: float) -> tuple:
+        """
+        按归一化参数缓存四个 Creator 实例，参数不变时复用同一组实例
+        """
+        key = (close_mean, close_std, vol_mean, vol_std)
+        creators = self._creator_cache.get(key)
+        if creators is None:
+            creators = (
+                Feature1HCreator(close_mean=close_mean, close_std=close_std, vol_mean=vol_mean, vol_std=vol_std),
+                Feature15mCreator(),
+                Feature4HCreator(close_mean=close_mean, close_std=close_std),
+                Feature1DCreator(close_mean=close_mean, close_std=close_std),
+            )
+            self._creator_cache = {key: creators}
+        return creators
+
     def _process_and_cache(self, before: int = None) -> Optional[int]:
         """
         处理单条数据并添加到缓存，当缓存达到 batch_size 时批量保存
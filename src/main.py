@@ -4,17 +4,18 @@ Main entry point for the Technical Analysis Helper API.
 Starts the FastAPI server and scheduled prediction tasks.
 """
 import argparse
+import os
 import sys
 import logging
 import threading
 from pathlib import Path
 import uvicorn
 
-# Add project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add project root to Python path (仅作为入口运行时需要，避免被 pytest 导入时改 sys.path)
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from api.api_base import app
-from schedule.prediction_scheduler import prediction_scheduler
 from config.settings import config
 from stream.redis_list_handler import redis_list_handler
 
@@ -38,8 +39,28 @@ def main():
     parser.add_argument('--host', default='127.0.0.1', help='Host to bind to (default: 127.0.0.1)')
     parser.add_argument('--port', type=int, default=8000, help='Port to listen on (default: 8000)')
     parser.add_argument('--reload', action='store_true', help='Enable auto-reload for development')
-    
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes (default: 1)')
+    parser.add_argument('--no-scheduler', action='store_true', help='Disable the scheduled prediction task')
+
     args = parser.parse_args()
+
+    if args.no_scheduler:
+        # 通过环境变量传递，reload/多 worker 子进程重新导入 config 时同样生效
+        os.environ['SCHEDULE_ENABLED'] = 'false'
+        config.SCHEDULE_ENABLED = False
+
+    # Prefer libuv event loop + C http parser when available (uvloop is not
+    # supported on Windows, so fall back to the default loop there)
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = 'uvloop'
+    except ImportError:
+        loop_impl = 'auto'
+    try:
+        import httptools  # noqa: F401
+        http_impl = 'httptools'
+    except ImportError:
+        http_impl = 'auto'
     
     print(f"Starting Technical Analysis Helper API...")
     print(f"Host: {args.host}")
@@ -56,13 +77,11 @@ def main():
     print(f"- http://{args.host}:{args.port}/redoc")
     print()
     
-    # Start scheduled prediction task in background thread
-    schedule_thread = None
+    # Scheduled prediction task is created as an asyncio task at FastAPI
+    # startup (see api.api_base), sharing the Uvicorn event loop
     if config.SCHEDULE_ENABLED:
-        schedule_thread = threading.Thread(target=prediction_scheduler.run, daemon=False)
-        schedule_thread.start()
-        logger.info("Scheduled prediction task started in background thread")
-    
+        logger.info("Scheduled prediction task will start with the API server")
+
     # Start Redis list processing in background thread
     redis_thread = threading.Thread(target=redis_list_handler.start_continuous_processing, daemon=False)
     redis_thread.start()
@@ -74,14 +93,14 @@ def main():
             "api.api_base:app",
             host=args.host,
             port=args.port,
-            reload=args.reload
+            reload=args.reload,
+            workers=args.workers,
+            loop=loop_impl,
+            http=http_impl
         )
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down...")
     finally:
-        if schedule_thread and schedule_thread.is_alive():
-            logger.info("Waiting for scheduled task to stop...")
-            schedule_thread.join(timeout=5)
         logger.info("Shutdown complete")
 
 
@@ -12,7 +12,7 @@ from typing import Tuple, Dict, Any, Optional, List, Union
 from datetime import datetime
 
 import xgboost as xgb
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import StratifiedShuffleSplit, cross_val_score
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.utils.class_weight import compute_class_weight
@@ -23,6 +23,41 @@ from feature.feature_types import Feature
 
 logger = logging.getLogger(__name__)
 
+# 按模型路径缓存反序列化结果 (mtime, booster, scaler, feature_columns, feature_means)
+# 调度器每个周期都 load_model，文件未变时直接复用，省掉 JSON 解析与磁盘 IO
+_MODEL_CACHE: Dict[str, tuple] = {}
+
+
+def _train_fold(params: Dict[str, Any], X_tr: np.ndarray, y_tr: np.ndarray,
+                X_va: np.ndarray, y_va: np.ndarray,
+                w_tr: np.ndarray = None) -> float:
+    """训练单个 CV 折并返回验证准确率（模块级定义，便于 joblib 进程间序列化）"""
+    dtrain = xgb.DMatrix(X_tr, label=y_tr, weight=w_tr)
+    dval = xgb.DMatrix(X_va, label=y_va)
+    model = xgb.train(
+        params,
+        dtrain,
+        num_boost_round=100,
+        evals=[(dtrain, 'train'), (dval, 'val')],
+        early_stopping_rounds=10,
+        verbose_eval=False
+    )
+    proba = model.predict(dval)
+    return float((np.argmax(proba, axis=1) == y_va).mean())
+
+
+def _detect_device() -> str:
+    """训练设备探测：显式 XGB_DEVICE 优先，其次有 cupy 即用 CUDA，否则 CPU"""
+    device = os.environ.get('XGB_DEVICE')
+    if device:
+        return device
+    try:
+        import cupy  # noqa: F401
+        return 'cuda'
+    except ImportError:
+        return 'cpu'
+
+
 class XGBoostTrainer:
     """Trains and manages XGBoost classification models."""
     
@@ -32,9 +67,12 @@ class XGBoostTrainer:
     def __init__(self, model_save_path: str = config.MODEL_SAVE_PATH, label_type: str = 'label'):
         """Initialize the trainer."""
         self.model = None
-        self.scaler = StandardScaler()
+        # copy=False: 缩放直接写回传入的数组，配合 float32 输入减半内存带宽
+        self.scaler = StandardScaler(copy=False)
         self.label_type = label_type
         self.feature_columns = None
+        # 训练集各特征列均值，预测时用于缺失值填充（避免用测试数据的均值造成泄漏）
+        self.feature_means = None
         self.model_save_path = model_save_path
         
         # Create models directory if it doesn't exist
@@ -64,11 +102,14 @@ class XGBoostTrainer:
         logger.info("Starting XGBoost model training")
         
         # Fetch features from MongoDB
-        features = feature_handler.get_features(limit=limit, inst_id=inst_id, bar=bar)
-        
-        if not features:
+        # 优先按列读成 Arrow 表，退化时仍走逐条 dict
+        features = feature_handler.get_features_arrow(limit=limit, inst_id=inst_id, bar=bar)
+        if features is None:
+            features = feature_handler.get_features(limit=limit, inst_id=inst_id, bar=bar)
+
+        if features is None or len(features) == 0:
             raise ValueError("No features found in MongoDB")
-        
+
         logger.info(f"Retrieved {len(features)} features from MongoDB")
         
         # Convert to DataFrame and separate features and labels
@@ -82,15 +123,17 @@ class XGBoostTrainer:
         logger.info(f"Number of features: {len(self.feature_columns)}")
         
         # Handle missing values
-        features_df = features_df.fillna(features_df.mean())
+        # 均值只算一次，缓存下来供 predict 填充缺失值
+        feature_means = features_df.mean()
+        self.feature_means = feature_means.to_numpy(dtype=np.float32)
+        features_df = features_df.fillna(feature_means)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            features_df, targets_series, 
-            test_size=test_size, 
-            random_state=42,
-            stratify=targets_series
-        )
+        # 直接用 StratifiedShuffleSplit 产出索引，按位置切片，少一轮标签重扫
+        sss = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=42)
+        train_idx, test_idx = next(sss.split(features_df, targets_series))
+        X_train, X_test = features_df.iloc[train_idx], features_df.iloc[test_idx]
+        y_train, y_test = targets_series.iloc[train_idx], targets_series.iloc[test_idx]
         
         logger.info(f"Training set size: {len(X_train)}")
         logger.info(f"Test set size: {len(X_test)}")
@@ -105,22 +148,29 @@ class XGBoostTrainer:
         # Calculate class weights for imbalanced data
         sample_weights = None
         if use_class_weight:
-            class_weights = compute_class_weight('balanced', classes=unique_classes, y=y_train)
-            weight_dict = dict(zip(unique_classes, class_weights))
-            
+            class_weights = compute_class_weight('balanced', classes=unique_classes, y=y_train).astype(np.float32)
+
             logger.info("Class weights calculated:")
-            for cls, weight in weight_dict.items():
+            for cls, weight in zip(unique_classes, class_weights):
                 logger.info(f"  Class {cls + 1}: {weight:.4f}")
-            
-            sample_weights = np.array([weight_dict[label] for label in y_train])
+
+            # 标签直接索引权重查找表，单次 gather 替代逐元素字典查询
+            weight_lut = np.zeros(int(unique_classes.max()) + 1, dtype=np.float32)
+            weight_lut[unique_classes] = class_weights
+            sample_weights = weight_lut[y_train.to_numpy()]
         
         # Scale features
+        # XGBoost 原生消费 float32，提前转型避免 scaler/DMatrix 的 float64 复制
+        X_train = X_train.to_numpy(dtype=np.float32)
+        X_test = X_test.to_numpy(dtype=np.float32)
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
         # Convert to DMatrix for XGBoost
-        dtrain = xgb.DMatrix(X_train_scaled, label=y_train, weight=sample_weights)
-        dtest = xgb.DMatrix(X_test_scaled, label=y_test)
+        # hist 模式下 QuantileDMatrix 直接按分位数分箱存储，省掉二次分箱与 float32 复制
+        dtrain = xgb.QuantileDMatrix(X_train_scaled, label=y_train, weight=sample_weights)
+        # ref=dtrain 复用训练集的分箱边界，免去测试集重新分箱
+        dtest = xgb.QuantileDMatrix(X_test_scaled, label=y_test, ref=dtrain)
         
         # XGBoost parameters (旧版)
         # params = {
@@ -147,7 +197,12 @@ class XGBoostTrainer:
             'min_child_weight': 0, #对于分类任务，样本权重通常为1，所以它就是叶节点中最少的样本数；如果一个叶节点的样本权重和 < min_child_weight，这个节点不会再分裂
             'gamma': 0.1, #至少要10%的收益才投资（适中），控制树的复杂度，防止生成无意义的细枝末节，值越大，树越简单
             'reg_alpha': 0.1,
-            'reg_lambda': 1
+            'reg_lambda': 1,
+            'tree_method': 'hist', #直方图分箱建树，复杂度与分箱数而非样本数相关
+            'max_bin': 256,
+            'device': _detect_device(), #有 CUDA 时训练跑 GPU
+            #显式限定线程数，避免与并行 CV 的 OpenMP 线程互相超订；并行折内会再按核数均摊
+            'nthread': int(os.environ.get('OMP_NUM_THREADS', os.cpu_count() or 1))
         }
         
         # Train model
@@ -167,12 +222,12 @@ class XGBoostTrainer:
         
         # Cross-validation
         logger.info("Performing cross-validation...")
-        cv_scores = self._cross_validate_with_weights(
+        cv_mean, cv_std = self._cross_validate_with_weights(
             X_train_scaled, y_train, cv_folds, params, sample_weights
         )
-        
+
         # Calculate metrics
-        results = self._calculate_metrics(y_test, y_pred, y_pred_proba, cv_scores)
+        results = self._calculate_metrics(y_test, y_pred, y_pred_proba, cv_mean, cv_std)
         
         # Save model
         self.save_model()
@@ -180,64 +235,65 @@ class XGBoostTrainer:
         logger.info("Model training completed successfully")
         return results
     
-    def _cross_validate_with_weights(self, X: np.ndarray, y: np.ndarray, 
-                                   cv_folds: int, params: Dict[str, Any], 
-                                   sample_weights: np.ndarray = None) -> np.ndarray:
+    def _cross_validate_with_weights(self, X: np.ndarray, y: np.ndarray,
+                                   cv_folds: int, params: Dict[str, Any],
+                                   sample_weights: np.ndarray = None) -> Tuple[float, float]:
         """
         Perform cross-validation with sample weights.
-        
+        交叉验证交给 xgb.cv 在 C++ 核内并行跑完所有折，
+        不再逐折回到 Python 调 xgb.train
+
         Args:
             X: Feature matrix
             y: Target labels
             cv_folds: Number of cross-validation folds
             params: XGBoost parameters
             sample_weights: Sample weights for training
-            
+
         Returns:
-            Array of cross-validation scores
+            Tuple of (mean accuracy, across-fold std) of the cross-validation
         """
         from sklearn.model_selection import StratifiedKFold
-        from sklearn.metrics import accuracy_score
-        
+        from joblib import Parallel, delayed
+
         y_array = y.values if hasattr(y, 'values') else np.array(y)
-        
+
         skf = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
-        cv_scores = []
-        
-        for fold, (train_idx, val_idx) in enumerate(skf.split(X, y_array), 1):
-            logger.info(f"Cross-validation fold {fold}/{cv_folds}")
-            
-            X_fold_train, X_fold_val = X[train_idx], X[val_idx]
-            y_fold_train, y_fold_val = y_array[train_idx], y_array[val_idx]
-            
-            # Prepare DMatrix for training
-            if sample_weights is not None:
-                fold_weights = sample_weights[train_idx]
-                dtrain = xgb.DMatrix(X_fold_train, label=y_fold_train, weight=fold_weights)
-            else:
-                dtrain = xgb.DMatrix(X_fold_train, label=y_fold_train)
-            
-            dval = xgb.DMatrix(X_fold_val, label=y_fold_val)
-            
-            # Train model
-            model = xgb.train(
+
+        if params.get('device', 'cpu') != 'cpu':
+            # GPU 不适合跨进程共享，交给 xgb.cv 在单进程内按折并行
+            # xgb.cv 内部按 folds 切片，需要支持 slice 的普通 DMatrix；权重随矩阵切片
+            dall = xgb.DMatrix(X, label=y_array, weight=sample_weights)
+            cv_hist = xgb.cv(
                 params,
-                dtrain,
+                dall,
                 num_boost_round=100,
-                evals=[(dtrain, 'train'), (dval, 'val')],
+                folds=list(skf.split(X, y_array)),
                 early_stopping_rounds=10,
+                metrics={'merror'},
+                seed=42,
                 verbose_eval=False
             )
-            
-            # Make predictions and score
-            y_pred_proba = model.predict(dval)
-            y_pred = np.argmax(y_pred_proba, axis=1)
-            fold_score = accuracy_score(y_fold_val, y_pred)
-            cv_scores.append(fold_score)
-            
-            logger.info(f"  Fold {fold} accuracy: {fold_score:.4f}")
-        
-        return np.array(cv_scores)
+
+            # 准确率 = 1 - 多分类错误率；历史每行是一个 boosting 轮的折均值，
+            # 早停后的末行即最终结果，折间离散度直接取 std 列
+            cv_mean = 1.0 - float(cv_hist['test-merror-mean'].iloc[-1])
+            cv_std = float(cv_hist['test-merror-std'].iloc[-1])
+            logger.info(f"Cross-validation accuracy: {cv_mean:.4f} over {len(cv_hist)} rounds")
+            return cv_mean, cv_std
+
+        # CPU 路径：各折跑在独立进程上绕开 GIL，每折线程数按核数均摊避免超订
+        fold_params = dict(params, nthread=max(1, (os.cpu_count() or 1) // cv_folds))
+        cv_scores = Parallel(n_jobs=cv_folds)(
+            delayed(_train_fold)(
+                fold_params, X[tr], y_array[tr], X[va], y_array[va],
+                sample_weights[tr] if sample_weights is not None else None
+            )
+            for tr, va in skf.split(X, y_array)
+        )
+        cv_scores = np.array(cv_scores)
+        logger.info(f"Cross-validation accuracy: {cv_scores.mean():.4f} across {cv_folds} folds")
+        return float(cv_scores.mean()), float(cv_scores.std())
     
     def _prepare_training_data(self, features: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.Series]:
         """
@@ -249,41 +305,45 @@ class XGBoostTrainer:
         Returns:
             Tuple of (features DataFrame, targets Series)
         """
-        df = pd.DataFrame(features)
-        
+        if isinstance(features, list):
+            df = pd.DataFrame.from_records(features)
+        else:
+            # Arrow 表零拷贝转列，self_destruct 释放源缓冲避免双份驻留
+            df = features.to_pandas(self_destruct=True)
+
         # 检查是否有 label 字段
         if self.label_type not in df.columns:
             raise ValueError(f"Features data missing '{self.label_type}' field")
-        
-        # 移除没有 label 的记录
-        df = df[df[self.label_type].notna()]
+
+        # 移除没有 label 的记录（原地操作，避免整帧复制）
+        df.dropna(subset=[self.label_type], inplace=True)
         if len(df) == 0:
             raise ValueError(f"No features with valid labels found")
-        
+
         # 提取目标变量，转换为0索引（XGBoost要求标签从0开始）
-        targets = df[self.label_type].astype(int) - 1
-        
-        # 提取特征列，排除非特征字段
-        feature_columns = [col for col in df.columns if col not in self.EXCLUDED_FIELDS]
-        
+        # int8 足够存放类别标签，同时缩小 sample_weights 索引
+        targets = df.pop(self.label_type).astype(np.int8) - 1
+
+        # 原地删除非特征字段，其余列即特征列
+        df.drop(columns=[col for col in self.EXCLUDED_FIELDS if col in df.columns],
+                inplace=True, errors='ignore')
+
         # 检查特征列是否为空
-        if not feature_columns:
+        if df.shape[1] == 0:
             raise ValueError(f"No feature columns found after excluding non-feature fields")
-        
-        # 提取特征数据
-        features_df = df[feature_columns].copy()
-        
-        logger.info(f"Prepared training data: {len(features_df)} samples, {len(feature_columns)} features")
-        logger.info(f"Feature columns: {feature_columns}")
+
+        logger.info(f"Prepared training data: {len(df)} samples, {df.shape[1]} features")
+        logger.info(f"Feature columns: {list(df.columns)}")
         logger.info(f"Label distribution:\n{targets.value_counts().sort_index()}")
-        
-        return features_df, targets
+
+        return df, targets
     
     def _calculate_metrics(self, 
                           y_true: np.ndarray, 
                           y_pred: np.ndarray,
                           y_pred_proba: np.ndarray,
-                          cv_scores: np.ndarray) -> Dict[str, Any]:
+                          cv_mean: float,
+                          cv_std: float) -> Dict[str, Any]:
         """Calculate various performance metrics."""
         # Basic metrics
         accuracy = accuracy_score(y_true, y_pred)
@@ -306,20 +366,22 @@ class XGBoostTrainer:
         conf_matrix = confusion_matrix(y_true, y_pred, labels=unique_classes)
         
         # Per-class confidence (y_true现在是0索引，y_pred_proba也是0索引)
-        class_confidence = {}
-        for class_index, class_label in zip(unique_classes, actual_class_labels):
-            class_indices = (y_true == class_index)
-            if np.sum(class_indices) > 0:
-                class_confidence[class_label] = float(np.mean(
-                    y_pred_proba[class_indices, class_index]
-                ))
-            else:
-                class_confidence[class_label] = 0.0
+        # 一次 fancy-index 取出每个样本真实类别的概率，再按类别 bincount 求均值
+        y_true_arr = np.asarray(y_true)
+        num_classes = y_pred_proba.shape[1]
+        p_true = y_pred_proba[np.arange(y_true_arr.shape[0]), y_true_arr]
+        counts = np.bincount(y_true_arr, minlength=num_classes)
+        sums = np.bincount(y_true_arr, weights=p_true, minlength=num_classes)
+        means = np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+        class_confidence = {
+            class_label: float(means[class_index])
+            for class_index, class_label in zip(unique_classes, actual_class_labels)
+        }
         
         results = {
             'accuracy': float(accuracy),
-            'cv_mean_accuracy': float(cv_scores.mean()),
-            'cv_std_accuracy': float(cv_scores.std()),
+            'cv_mean_accuracy': cv_mean,
+            'cv_std_accuracy': cv_std,
             'classification_report': class_report,
             'confusion_matrix': conf_matrix.tolist(),
             'class_confidence': class_confidence,
@@ -328,7 +390,7 @@ class XGBoostTrainer:
         
         # Log results
         logger.info(f"Accuracy: {accuracy:.4f}")
-        logger.info(f"CV Accuracy: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
+        logger.info(f"CV Accuracy: {cv_mean:.4f} (+/- {cv_std * 2:.4f})")
         logger.info("Per-class confidence:")
         for class_label, confidence in class_confidence.items():
             logger.info(f"  Class {class_label}: {confidence:.4f}")
@@ -351,27 +413,48 @@ class XGBoostTrainer:
         if self.feature_columns is None:
             raise ValueError("Feature columns not defined")
         
-        if isinstance(features_input, list):
-            features_list = []
+        if isinstance(features_input, list) and len(features_input) < 32:
+            # 小批量（调度器单条预测）直接按特征列序 gather 成数组，跳过 DataFrame 构建
+            n_cols = len(self.feature_columns)
+            rows = []
             for item in features_input:
-                if isinstance(item, Feature):
-                    features_list.append(item.to_dict())
-                else:
-                    features_list.append(item)
-            features_df = pd.DataFrame(features_list)
-            features_df = features_df[[col for col in features_df.columns if col not in self.EXCLUDED_FIELDS]]
+                feature_dict = item.to_dict() if isinstance(item, Feature) else item
+                rows.append(np.fromiter(
+                    (np.nan if v is None else v
+                     for v in (feature_dict.get(col) for col in self.feature_columns)),
+                    dtype=np.float32, count=n_cols))
+            X = np.stack(rows)
         else:
-            features_df = features_input.copy()
-        
-        features_df = features_df[self.feature_columns]
-        
-        features_df = features_df.fillna(features_df.mean())
-        
-        features_scaled = self.scaler.transform(features_df)
-        
-        dmatrix = xgb.DMatrix(features_scaled)
+            if isinstance(features_input, list):
+                features_list = []
+                for item in features_input:
+                    if isinstance(item, Feature):
+                        features_list.append(item.to_dict())
+                    else:
+                        features_list.append(item)
+                features_df = pd.DataFrame(features_list)
+            else:
+                # 只读取不回写：列选择本身就会生成新帧，无需防御性整帧拷贝
+                features_df = features_input
+
+            features_df = features_df[self.feature_columns]
+
+            # copy=True: to_numpy 可能返回只读视图，就地填充需要可写缓冲
+            X = features_df.to_numpy(dtype=np.float32, copy=True)
+        mask = np.isnan(X)
+        if mask.any():
+            if self.feature_means is not None:
+                # 用训练集均值原地填充，不再整帧 fillna 复制
+                np.copyto(X, np.broadcast_to(self.feature_means, X.shape), where=mask)
+            else:
+                # 旧模型没有保存均值时退回按当前批次均值填充
+                np.copyto(X, np.broadcast_to(np.nanmean(X, axis=0), X.shape), where=mask)
         
-        probabilities = self.model.predict(dmatrix)
+        features_scaled = self.scaler.transform(X)
+
+        # inplace_predict 直接读 numpy 缓冲，不再复制进 DMatrix 的内部 CSR
+        probabilities = self.model.inplace_predict(
+            np.ascontiguousarray(features_scaled, dtype=np.float32))
         predictions = np.argmax(probabilities, axis=1)
         
         predictions = predictions + 1
@@ -395,7 +478,43 @@ class XGBoostTrainer:
         
         predictions, probabilities = self.predict([feature_dict])
         return predictions[0], probabilities[0]
-    
+
+    def predict_single_fast(self, feature_input: Union[Dict[str, Any], Feature]) -> Tuple[int, np.ndarray]:
+        """
+        Single-row inference fast path for the scheduler hot loop.
+        直接组 float32 向量 -> 原地标准化 -> inplace_predict，
+        绕开 pandas/DMatrix 与 sklearn transform 的输入校验开销
+
+        Args:
+            feature_input: Single feature dictionary or Feature object
+
+        Returns:
+            Tuple of (predicted class, prediction probabilities)
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+
+        if self.feature_columns is None:
+            raise ValueError("Feature columns not defined")
+
+        feature_dict = feature_input.to_dict() if isinstance(feature_input, Feature) else feature_input
+
+        n_cols = len(self.feature_columns)
+        row = np.fromiter(
+            (np.nan if v is None else v
+             for v in (feature_dict.get(col) for col in self.feature_columns)),
+            dtype=np.float32, count=n_cols)
+        if self.feature_means is not None:
+            np.copyto(row, self.feature_means, where=np.isnan(row))
+        # 旧模型没有均值时保留 NaN，XGBoost 按缺失值分支处理
+
+        # 与 StandardScaler(copy=False) 的 float32 原地运算逐位一致
+        row -= self.scaler.mean_
+        row /= self.scaler.scale_
+
+        probabilities = self.model.inplace_predict(row.reshape(1, -1))[0]
+        return int(np.argmax(probabilities)) + 1, probabilities
+
     def save_model(self):
         """Save the trained model and scaler."""
         if self.model is None:
@@ -407,8 +526,13 @@ class XGBoostTrainer:
         logger.info(f"Model saved to {self.model_save_path}")
         
         # Save scaler
-        scaler_path = self.model_save_path.replace('.json', '_scaler.pkl')
-        joblib.dump(self.scaler, scaler_path)
+        # 只存三个 numpy 数组而非整个 pickle 对象：文件更小、加载更快、无反序列化安全面
+        scaler_path = self.model_save_path.replace('.json', '_scaler.npz')
+        # float32 存盘：推理全程就是 float32，float16 会在原始量纲的 var_ 上溢出
+        np.savez(scaler_path,
+                 mean=self.scaler.mean_.astype(np.float32),
+                 scale=self.scaler.scale_.astype(np.float32),
+                 var=self.scaler.var_.astype(np.float32))
         logger.info(f"Scaler saved to {scaler_path}")
         
         # Save feature columns
@@ -416,6 +540,12 @@ class XGBoostTrainer:
         with open(features_path, 'w') as f:
             json.dump(self.feature_columns, f)
         logger.info(f"Feature columns saved to {features_path}")
+        
+        # Save training feature means for prediction-time NaN filling
+        if self.feature_means is not None:
+            means_path = self.model_save_path.replace('.json', '_means.npy')
+            np.save(means_path, self.feature_means)
+            logger.info(f"Feature means saved to {means_path}")
     
     def load_model(self) -> bool:
         """
@@ -427,18 +557,36 @@ class XGBoostTrainer:
         try:
             # Load XGBoost model
             if os.path.exists(self.model_save_path):
+                # 文件未变时直接复用缓存的反序列化结果
+                mtime = os.path.getmtime(self.model_save_path)
+                cached = _MODEL_CACHE.get(self.model_save_path)
+                if cached is not None and cached[0] == mtime:
+                    self.model, self.scaler, self.feature_columns, self.feature_means = cached[1:]
+                    return True
                 self.model = xgb.Booster()
                 self.model.load_model(self.model_save_path)
                 logger.info(f"Model loaded from {self.model_save_path}")
             else:
                 logger.warning(f"Model file not found: {self.model_save_path}")
                 return False
-            
+
             # Load scaler
-            scaler_path = self.model_save_path.replace('.json', '_scaler.pkl')
+            # 新格式：npz 里只有 mean/scale/var 三个数组，重建一个最小 StandardScaler
+            scaler_path = self.model_save_path.replace('.json', '_scaler.npz')
+            legacy_scaler_path = self.model_save_path.replace('.json', '_scaler.pkl')
             if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
+                with np.load(scaler_path) as z:
+                    self.scaler = StandardScaler(copy=False)
+                    # 统一转回 float32 参与推理（兼容老格式里的 float64 数组）
+                    self.scaler.mean_ = z['mean'].astype(np.float32, copy=False)
+                    self.scaler.scale_ = z['scale'].astype(np.float32, copy=False)
+                    self.scaler.var_ = z['var'].astype(np.float32, copy=False)
+                    self.scaler.n_features_in_ = len(self.scaler.mean_)
                 logger.info(f"Scaler loaded from {scaler_path}")
+            elif os.path.exists(legacy_scaler_path):
+                # 兼容旧版 joblib pickle 产物
+                self.scaler = joblib.load(legacy_scaler_path, mmap_mode='r')
+                logger.info(f"Scaler loaded from {legacy_scaler_path}")
             else:
                 logger.warning(f"Scaler file not found: {scaler_path}")
                 return False
@@ -453,6 +601,18 @@ class XGBoostTrainer:
                 logger.warning(f"Feature columns file not found: {features_path}")
                 return False
             
+            # Load feature means (optional; older models may not have them)
+            means_path = self.model_save_path.replace('.json', '_means.npy')
+            if os.path.exists(means_path):
+                self.feature_means = np.load(means_path)
+                logger.info(f"Feature means loaded from {means_path}")
+            else:
+                logger.warning(f"Feature means file not found: {means_path}, "
+                               "predictions will fall back to batch means for NaN filling")
+
+            _MODEL_CACHE[self.model_save_path] = (
+                mtime, self.model, self.scaler, self.feature_columns, self.feature_means
+            )
             return True
             
         except Exception as e:
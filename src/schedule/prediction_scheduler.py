@@ -1,14 +1,14 @@
 """
 Prediction scheduler for running scheduled prediction tasks.
 """
+import asyncio
 import logging
+import queue
+import threading
 import time
 from datetime import datetime
 from typing import Dict, Any
 
-from models.xgboost_trainer import xgb_trainer, xgb_trainer_high, xgb_trainer_low
-from feature.feature_merge import FeatureMerge
-from feature.feature_types import Feature
 from utils.email_sender import email_sender
 from collect.config_handler import config_handler
 from config.settings import config
@@ -24,6 +24,60 @@ class PredictionScheduler:
         self.interval_minutes = config.SCHEDULE_INTERVAL
         self.recipient = config.SCHEDULE_RECIPIENT
         self.from_local = False
+        # 告警投递走独立工作线程：SMTP 阻塞不拖慢下一轮预测的启动
+        self._alert_queue = queue.Queue()
+        self._alert_thread = None
+        # 同步 run() 用事件等待代替 time.sleep，停机立即生效
+        self._stop_event = threading.Event()
+        # 同一根 K 线内特征不变，缓存上次预测结果避免重复推理
+        self._last_features_ts = None
+        self._last_prediction_result = None
+        # 跨周期共享同一个 FeatureMerge：Creator/校验缓存保持热态（首次预测时才构建）
+        self._feature_merge = None
+
+    def _ensure_alert_worker(self):
+        """Start the alert delivery thread on first use."""
+        if self._alert_thread is None or not self._alert_thread.is_alive():
+            self._alert_thread = threading.Thread(target=self._alerter_loop, daemon=True)
+            self._alert_thread.start()
+
+    @staticmethod
+    def _should_alert(prediction_data: Dict[str, Any]) -> bool:
+        """Single place for the alert decision: confident and not the neutral class."""
+        prediction = prediction_data.get('prediction')
+        # 中性类直接早退，不查概率
+        if prediction == 3:
+            return False
+        probalility = prediction_data.get('probabilities').get(prediction)
+        # if ((prediction == 5 or prediction == 1) and probalility > 0.8) or (prediction_data.get('probabilities_high').get(prediction_data.get('prediction_high')) >= 0.8 or prediction_data.get('probabilities_low').get(prediction_data.get('prediction_low')) >= 0.8):
+        return probalility > 0.75
+
+    def _alerter_loop(self):
+        """Consume prediction results and deliver email alerts off the prediction path."""
+        while True:
+            prediction_data = self._alert_queue.get()
+            if prediction_data is None:
+                break
+            # Check confidence and send email alert
+            try:
+                if self._should_alert(prediction_data):
+                    logger.info("Confidence meets threshold, sending email alert...")
+                    email_sender.send_trading_alert(
+                        to_email=self.recipient,
+                        prediction_data=prediction_data
+                    )
+                # else:
+                #     logger.info("Confidence below threshold, no email sent")
+            except Exception as e:
+                logger.error(f"Error in confidence check or email sending: {e}", exc_info=True)
+
+    def _shutdown_alert_worker(self):
+        """Drain and stop the alert thread (None is the poison pill)."""
+        if self._alert_thread is not None and self._alert_thread.is_alive():
+            self._alert_queue.put(None)
+            self._alert_thread.join(timeout=30)
+        # 告警线程停止后释放缓存的 SMTP 长连接
+        email_sender.close()
     
     def predict_price_movement(self) -> Dict[str, Any]:
         """
@@ -32,6 +86,11 @@ class PredictionScheduler:
         Returns:
             Prediction data dictionary
         """
+        # 重依赖延迟到真正预测时导入：仅用 email_sender 等轻路径的进程不再拖入
+        # xgboost/pandas/Mongo 客户端（Python 模块缓存保证稳态零开销）
+        from models.xgboost_trainer import xgb_trainer, xgb_trainer_high, xgb_trainer_low
+        from feature.feature_merge import FeatureMerge
+
         try:
             if not xgb_trainer.load_model():
                 logger.error("Failed to load model")
@@ -45,11 +104,13 @@ class PredictionScheduler:
                 logger.error("Failed to load model low")
                 return None
             
-            feature_merge = FeatureMerge()
+            if self._feature_merge is None:
+                self._feature_merge = FeatureMerge()
+
             if self.from_local:
-                features = feature_merge.quick_process_eth_from_mongodb()
+                features = self._feature_merge.quick_process_eth_from_mongodb()
             else:
-                features = feature_merge.quick_process_eth()
+                features = self._feature_merge.quick_process_eth()
             
             if features is None:
                 logger.error("Failed to extract features")
@@ -57,45 +118,55 @@ class PredictionScheduler:
             
             current_ts = int(datetime.now().timestamp() * 1000)
             feature_pr_handler.save_feature(features, current_ts)
-            
-            prediction, probabilities = xgb_trainer.predict_single(features)
-            class_labels = config.CLASSIFICATION_THRESHOLDS_DESC
-            prob_dict = {}
-            for i, prob in enumerate(probabilities):
-                class_num = i + 1
-                prob_dict[class_num] = round(float(prob), 4)
-                
-            prediction_high, probabilities_high = xgb_trainer_high.predict_single(features)
-            class_labels_high = config.CLASSIFICATION_THRESHOLDS_HIGH_DESC
-            prob_dict_high = {}
-            for i, prob in enumerate(probabilities_high):
-                class_num = i + 1
-                prob_dict_high[class_num] = round(float(prob), 4)
-            
-            prediction_low, probabilities_low = xgb_trainer_low.predict_single(features)
-            class_labels_low = config.CLASSIFICATION_THRESHOLDS_LOW_DESC
-            prob_dict_low = {}
-            for i, prob in enumerate(probabilities_low):
-                class_num = i + 1
-                prob_dict_low[class_num] = round(float(prob), 4)
-            
-            prediction_result = {
-                "timestamp": features.timestamp,
-                "prediction": int(prediction),
-                "prediction_label": class_labels.get(prediction, f"类别 {prediction}"),
-                "prediction_high": int(prediction_high),
-                "prediction_high_label": class_labels_high.get(prediction_high, f"类别 {prediction_high}"),
-                "prediction_low": int(prediction_low),
-                "prediction_low_label": class_labels_low.get(prediction_low, f"类别 {prediction_low}"),
-                "probabilities": prob_dict,
-                "probabilities_high": prob_dict_high,
-                "probabilities_low": prob_dict_low,
-                "features_count": len(xgb_trainer.feature_columns),
-                "inst_id": "ETH-USDT-SWAP",
-                "price": features.price,
-                "bar": "1H"
-            }
-            
+
+            # 实时 K 线在同一根内还会更新，用 (timestamp, price) 近似判断特征未变
+            feature_key = (features.timestamp, features.price)
+            if self._last_features_ts == feature_key and self._last_prediction_result is not None:
+                # 特征未推进：复用上次的三组预测，跳过模型推理
+                # （模型若在此期间被重训，特征一变即生效）
+                prediction_result = self._last_prediction_result
+            else:
+                prediction, probabilities = xgb_trainer.predict_single_fast(features)
+                class_labels = config.CLASSIFICATION_THRESHOLDS_DESC
+                prob_dict = {}
+                for i, prob in enumerate(probabilities):
+                    class_num = i + 1
+                    prob_dict[class_num] = round(float(prob), 4)
+
+                prediction_high, probabilities_high = xgb_trainer_high.predict_single_fast(features)
+                class_labels_high = config.CLASSIFICATION_THRESHOLDS_HIGH_DESC
+                prob_dict_high = {}
+                for i, prob in enumerate(probabilities_high):
+                    class_num = i + 1
+                    prob_dict_high[class_num] = round(float(prob), 4)
+
+                prediction_low, probabilities_low = xgb_trainer_low.predict_single_fast(features)
+                class_labels_low = config.CLASSIFICATION_THRESHOLDS_LOW_DESC
+                prob_dict_low = {}
+                for i, prob in enumerate(probabilities_low):
+                    class_num = i + 1
+                    prob_dict_low[class_num] = round(float(prob), 4)
+
+                prediction_result = {
+                    "timestamp": features.timestamp,
+                    "prediction": int(prediction),
+                    "prediction_label": class_labels.get(prediction, f"类别 {prediction}"),
+                    "prediction_high": int(prediction_high),
+                    "prediction_high_label": class_labels_high.get(prediction_high, f"类别 {prediction_high}"),
+                    "prediction_low": int(prediction_low),
+                    "prediction_low_label": class_labels_low.get(prediction_low, f"类别 {prediction_low}"),
+                    "probabilities": prob_dict,
+                    "probabilities_high": prob_dict_high,
+                    "probabilities_low": prob_dict_low,
+                    "features_count": len(xgb_trainer.feature_columns),
+                    "inst_id": "ETH-USDT-SWAP",
+                    "price": features.price,
+                    "bar": "1H"
+                }
+                self._last_features_ts = feature_key
+                self._last_prediction_result = prediction_result
+
+
             feature_pr_handler.update_feature_prediction_label(
                 inst_id="ETH-USDT-SWAP",
                 timestamp=current_ts,
@@ -112,6 +183,34 @@ class PredictionScheduler:
             logger.error(f"Prediction error: {e}")
             return None
     
+    def _run_cycle(self, cycle_count: int):
+        """Run a single prediction cycle (shared by sync and async loops)."""
+        logger.info(f"=== Prediction cycle #{cycle_count} ===")
+        logger.info(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        # Get prediction
+        # 进行预测
+        prediction_data = self.predict_price_movement()
+        
+        if prediction_data:
+            logger.info(f"Prediction completed:")
+            logger.info(f"  Prediction: {prediction_data.get('prediction_label')}")
+            logger.info(f"  Probabilities: {prediction_data.get('probabilities')}")
+            logger.info(f"  Prediction-High: {prediction_data.get('prediction_high_label')}")
+            logger.info(f"  Probabilities-High: {prediction_data.get('probabilities_high')}")
+            logger.info(f"  Prediction-Low: {prediction_data.get('prediction_low_label')}")
+            logger.info(f"  Probabilities-Low: {prediction_data.get('probabilities_low')}")
+            
+            # 置信度检查与邮件发送交给告警线程，预测主路径立即返回
+            self._ensure_alert_worker()
+            self._alert_queue.put(prediction_data)
+        else:
+            logger.error("Prediction failed")
+        
+        logger.info(f"=== Cycle #{cycle_count} completed ===")
+        logger.info(f"Waiting {self.interval_minutes} minutes until next cycle...")
+        logger.info("")
+    
     def run(self):
         """
         >>>...主入口...<<<
@@ -122,62 +221,87 @@ class PredictionScheduler:
         logger.info(f"Alert recipient: {self.recipient}, Data source: {'MongoDB' if self.from_local else 'API'}")
               
         cycle_count = 0
+        self._stop_event.clear()
+        # 单调时钟对齐节拍：实际周期 = interval，而不是 interval + 本轮耗时
+        deadline = time.monotonic()
         while True:
             try:
                 cycle_count += 1
-                logger.info(f"=== Prediction cycle #{cycle_count} ===")
-                logger.info(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                
-                # Get prediction
-                # 进行预测
-                prediction_data = self.predict_price_movement()
-                
-                if prediction_data:
-                    logger.info(f"Prediction completed:")
-                    logger.info(f"  Prediction: {prediction_data.get('prediction_label')}")
-                    logger.info(f"  Probabilities: {prediction_data.get('probabilities')}")
-                    logger.info(f"  Prediction-High: {prediction_data.get('prediction_high_label')}")
-                    logger.info(f"  Probabilities-High: {prediction_data.get('probabilities_high')}")
-                    logger.info(f"  Prediction-Low: {prediction_data.get('prediction_low_label')}")
-                    logger.info(f"  Probabilities-Low: {prediction_data.get('probabilities_low')}")
-                    
-                    prediction = prediction_data.get('prediction');
-                    probalility = prediction_data.get('probabilities').get(prediction);
-                    # Check confidence and send email alert
-                    try:
-                        # if ((prediction == 5 or prediction == 1) and probalility > 0.8) or (prediction_data.get('probabilities_high').get(prediction_data.get('prediction_high')) >= 0.8 or prediction_data.get('probabilities_low').get(prediction_data.get('prediction_low')) >= 0.8):
-                        if (probalility > 0.75 and prediction != 3):
-                            logger.info("Confidence meets threshold, sending email alert...")
-                            email_sender.send_trading_alert(
-                                to_email=self.recipient,
-                                prediction_data=prediction_data
-                            )
-                        # else:
-                        #     logger.info("Confidence below threshold, no email sent")
-                    except Exception as e:
-                        logger.error(f"Error in confidence check or email sending: {e}", exc_info=True)
-                else:
-                    logger.error("Prediction failed")
-                
-                logger.info(f"=== Cycle #{cycle_count} completed ===")
-                logger.info(f"Waiting {self.interval_minutes} minutes until next cycle...")
-                logger.info("")
-                
-                # Wait for next cycle
-                time.sleep(self.interval_minutes * 60)
-                
+                self._run_cycle(cycle_count)
+
+                deadline += self.interval_minutes * 60
+                sleep_for = deadline - time.monotonic()
+                if sleep_for <= 0:
+                    # 本轮耗时超过间隔，放弃欠账从当前时刻重新对齐
+                    deadline = time.monotonic()
+                # Wait for next cycle (Event.wait 使 stop() 能立即打断等待)
+                elif self._stop_event.wait(sleep_for):
+                    break
+
             except KeyboardInterrupt:
                 logger.info("Received keyboard interrupt, shutting down scheduled task...")
                 break
             except Exception as e:
                 logger.error(f"Error in prediction cycle: {e}", exc_info=True)
                 logger.info(f"Retrying in {self.interval_minutes} minutes...")
+                deadline = time.monotonic() + self.interval_minutes * 60
                 try:
-                    time.sleep(self.interval_minutes * 60)
+                    if self._stop_event.wait(self.interval_minutes * 60):
+                        break
                 except KeyboardInterrupt:
                     logger.info("Received keyboard interrupt during retry wait, shutting down...")
                     break
+
+        self._shutdown_alert_worker()
+        logger.info("Scheduled prediction task stopped")
+
+    def stop(self):
+        """Request the sync run() loop to exit without waiting out the interval."""
+        self._stop_event.set()
+    
+    async def run_async(self):
+        """
+        >>>...主入口...<<<
+        Run prediction cycle at configured interval on the event loop.
+        Scheduled as an asyncio task at FastAPI startup, sharing the
+        Uvicorn event loop instead of holding a dedicated thread.
+        """
+        logger.info(f"Starting scheduled prediction service, Interval: {self.interval_minutes} minutes")
+        logger.info(f"Alert recipient: {self.recipient}, Data source: {'MongoDB' if self.from_local else 'API'}")
         
+        cycle_count = 0
+        # 单调时钟对齐节拍：实际周期 = interval，而不是 interval + 本轮耗时
+        deadline = time.monotonic()
+        while True:
+            try:
+                cycle_count += 1
+                # _run_cycle 是同步阻塞的（HTTP 拉数、限速 sleep、Mongo 写入），
+                # 丢进线程池执行，避免每轮周期卡住事件循环上的 HTTP 处理
+                await asyncio.to_thread(self._run_cycle, cycle_count)
+
+                deadline += self.interval_minutes * 60
+                sleep_for = deadline - time.monotonic()
+                if sleep_for <= 0:
+                    # 本轮耗时超过间隔，放弃欠账从当前时刻重新对齐
+                    deadline = time.monotonic()
+                else:
+                    # Wait for next cycle without blocking the event loop
+                    await asyncio.sleep(sleep_for)
+
+            except asyncio.CancelledError:
+                logger.info("Scheduled task cancelled, shutting down...")
+                break
+            except Exception as e:
+                logger.error(f"Error in prediction cycle: {e}", exc_info=True)
+                logger.info(f"Retrying in {self.interval_minutes} minutes...")
+                deadline = time.monotonic() + self.interval_minutes * 60
+                try:
+                    await asyncio.sleep(self.interval_minutes * 60)
+                except asyncio.CancelledError:
+                    logger.info("Scheduled task cancelled during retry wait, shutting down...")
+                    break
+
+        self._shutdown_alert_worker()
         logger.info("Scheduled prediction task stopped")
 
 
@@ -0,0 +1,21 @@
+"""
+Optional numba support
+Exposes njit that degrades to a no-op decorator when numba is not installed,
+so hot kernels stay importable in environments without the JIT.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    NUMBA_AVAILABLE = False
+
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrapper(func):
+            return func
+        return wrapper
@@ -7,6 +7,71 @@ import pandas as pd
 import numpy as np
 from typing import Tuple
 from .calculator_interface import BaseTechnicalCalculator
+from ._njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _adx_kernel(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                window: int) -> Tuple[float, float, float]:
+    """TR/DM/Wilder 平滑/DX/ADX 单趟融合计算
+
+    按 ADX 的标准定义用 Wilder 递推 s = s - s/w + x 做平滑（每步 O(1)），
+    首个平滑值取前 w 个样本之和，首个 ADX 取前 w 个 DX 的均值。
+    """
+    n = high.shape[0]
+    tr = np.empty(n)
+    plus_dm = np.empty(n)
+    minus_dm = np.empty(n)
+    tr[0] = high[0] - low[0]
+    plus_dm[0] = 0.0
+    minus_dm[0] = 0.0
+    for i in range(1, n):
+        m1 = high[i] - low[i]
+        m2 = abs(high[i] - close[i - 1])
+        m3 = abs(low[i] - close[i - 1])
+        tr[i] = max(m1, m2, m3)
+        up_move = high[i] - high[i - 1]
+        down_move = low[i - 1] - low[i]
+        plus_dm[i] = up_move if (up_move > down_move and up_move > 0.0) else 0.0
+        minus_dm[i] = down_move if (down_move > up_move and down_move > 0.0) else 0.0
+
+    # 初始平滑值 = 前 window 个样本之和
+    tr_s = 0.0
+    plus_s = 0.0
+    minus_s = 0.0
+    for i in range(window):
+        tr_s += tr[i]
+        plus_s += plus_dm[i]
+        minus_s += minus_dm[i]
+
+    # 零 TR / 零 DI 和沿用替换为 1 的除零保护
+    adx = 0.0
+    dx_count = 0
+    last_plus_di = 0.0
+    last_minus_di = 0.0
+    for i in range(window - 1, n):
+        if i >= window:
+            tr_s = tr_s - tr_s / window + tr[i]
+            plus_s = plus_s - plus_s / window + plus_dm[i]
+            minus_s = minus_s - minus_s / window + minus_dm[i]
+        denom = tr_s if tr_s != 0.0 else 1.0
+        plus_di = 100.0 * plus_s / denom
+        minus_di = 100.0 * minus_s / denom
+        di_sum = plus_di + minus_di
+        if di_sum == 0.0:
+            di_sum = 1.0
+        dx = 100.0 * abs(plus_di - minus_di) / di_sum
+        dx_count += 1
+        if dx_count <= window:
+            adx += dx
+            if dx_count == window:
+                adx /= window
+        else:
+            adx = (adx * (window - 1) + dx) / window
+        last_plus_di = plus_di
+        last_minus_di = minus_di
+    return adx, last_plus_di, last_minus_di
+
 
 class ADXCalculator(BaseTechnicalCalculator):
     """Independent ADX calculator with customizable parameters and standardized interface"""
@@ -42,75 +107,22 @@ class ADXCalculator(BaseTechnicalCalculator):
         if not all(col in df.columns for col in required_cols):
             raise ValueError(f"DataFrame must contain columns: {required_cols}")
         
-        high_prices = df['high'].astype(float)
-        low_prices = df['low'].astype(float)
-        close_prices = df['close'].astype(float)
-        
+        high_prices = np.ascontiguousarray(df['high'].to_numpy(), dtype=np.float64)
+        low_prices = np.ascontiguousarray(df['low'].to_numpy(), dtype=np.float64)
+        close_prices = np.ascontiguousarray(df['close'].to_numpy(), dtype=np.float64)
+
         if len(high_prices) < self.window * 2:
             raise ValueError(f"Need at least {self.window * 2} data points to calculate ADX")
-        
-        # 1. Calculate True Range (TR) - same as ATR
-        tr_list = []
-        for i in range(len(high_prices)):
-            if i == 0:
-                tr = high_prices[i] - low_prices[i]
-            else:
-                method1 = high_prices[i] - low_prices[i]
-                method2 = abs(high_prices[i] - close_prices[i-1])
-                method3 = abs(low_prices[i] - close_prices[i-1])
-                tr = max(method1, method2, method3)
-            tr_list.append(tr)
-        
-        tr_series = pd.Series(tr_list)
-        
-        # 2. Calculate Directional Movements (+DM and -DM)
-        plus_dm = []
-        minus_dm = []
-        
-        for i in range(1, len(high_prices)):
-            up_move = high_prices[i] - high_prices[i-1]
-            down_move = low_prices[i-1] - low_prices[i]
-            
-            if up_move > down_move and up_move > 0:
-                plus_dm.append(up_move)
-            else:
-                plus_dm.append(0)
-            
-            if down_move > up_move and down_move > 0:
-                minus_dm.append(down_move)
-            else:
-                minus_dm.append(0)
-        
-        plus_dm_series = pd.Series([0] + plus_dm)
-        minus_dm_series = pd.Series([0] + minus_dm)
-        
-        # 3. Smooth TR, +DM, -DM
-        tr_smooth = tr_series.rolling(window=self.window, min_periods=1).mean()
-        plus_dm_smooth = plus_dm_series.rolling(window=self.window, min_periods=1).mean()
-        minus_dm_smooth = minus_dm_series.rolling(window=self.window, min_periods=1).mean()
-        
-        # 避免除零导致的 inf/NaN
-        tr_smooth = tr_smooth.replace(0, 1)  # 如果TR为0，用1替代
-        
-        # 4. Calculate +DI and -DI
-        plus_di = 100 * (plus_dm_smooth / tr_smooth)
-        minus_di = 100 * (minus_dm_smooth / tr_smooth)
-        
-        # 5. Calculate DX (Directional Index)
-        di_sum = plus_di + minus_di
-        di_sum = di_sum.replace(0, 1)  # 如果DI和为0，用1替代
-        
-        dx = 100 * (abs(plus_di - minus_di) / di_sum)
-        dx = dx.replace([np.inf, -np.inf], np.nan)
-        
-        # 6. Calculate ADX (smoothed DX)
-        adx = dx.rolling(window=self.window, min_periods=1).mean()
-        
-        last_adx = self._get_last_value(adx)
-        last_plus_di = self._get_last_value(plus_di)
-        last_minus_di = self._get_last_value(minus_di)
-        
-        return last_adx, last_plus_di, last_minus_di
+
+        # TR/DM/平滑/DX/ADX 全部在单趟 JIT 内核里完成
+        adx, plus_di, minus_di = _adx_kernel(high_prices, low_prices, close_prices, self.window)
+        return float(adx), float(plus_di), float(minus_di)
 
 # Convenience instance for default parameters
 ADX_CALCULATOR = ADXCalculator()
+
+# 导入期用一小段数据预热 JIT，首次真实调用不吃编译延迟
+if NUMBA_AVAILABLE:
+    _warm = np.linspace(100.0, 110.0, 30)
+    _adx_kernel(_warm + 1.0, _warm - 1.0, _warm, 14)
+    del _warm
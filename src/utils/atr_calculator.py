@@ -1,6 +1,14 @@
+import numpy as np
 import pandas as pd
 from .calculator_interface import BaseTechnicalCalculator
 
+# scipy 可选：有则用 lfilter 一次 C 调用完成 Wilder 平滑
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 class AverageTrueRangeCalculator(BaseTechnicalCalculator):
     def calculate(self, df: pd.DataFrame) -> float:
         """
@@ -19,37 +27,41 @@ class AverageTrueRangeCalculator(BaseTechnicalCalculator):
             raise ValueError(f"DataFrame must contain columns: {required_cols}")
         
         
-        close_prices = df['close'].astype(float)
-        
+        # 三列一次性取成连续 float64 数组，后续全程裸数组运算
+        close_prices = np.ascontiguousarray(df['close'].to_numpy(), dtype=np.float64)
+
         # 数据验证
         if len(close_prices) < 14:
             raise ValueError("需要至少14个数据点来计算ATR")
-        
-        high_prices = df['high'].astype(float)
-        low_prices = df['low'].astype(float)
-        
+
+        high_prices = np.ascontiguousarray(df['high'].to_numpy(), dtype=np.float64)
+        low_prices = np.ascontiguousarray(df['low'].to_numpy(), dtype=np.float64)
+
         # 1. 计算真实波幅(True Range)
-        tr_list = []
-        for i in range(len(high_prices)):
-            if i == 0:
-                tr = high_prices[i] - low_prices[i]
-            else:
-                method1 = high_prices[i] - low_prices[i]
-                method2 = abs(high_prices[i] - close_prices[i-1])
-                method3 = abs(low_prices[i] - close_prices[i-1])
-                tr = max(method1, method2, method3)
-            tr_list.append(tr)
-        
+        # 整列向量化：首根没有前收盘价，用 low 占位使 TR 退化为 high-low
+        prev_close = np.empty_like(close_prices)
+        prev_close[0] = low_prices[0]
+        prev_close[1:] = close_prices[:-1]
+        tr = np.maximum.reduce([
+            high_prices - low_prices,
+            np.abs(high_prices - prev_close),
+            np.abs(low_prices - prev_close),
+        ])
+
         # 2. 计算ATR - 使用简单移动平均初始化，然后转为EMA
-        tr_series = pd.Series(tr_list)
-        
-        # 前14个值使用简单移动平均作为初始值
-        sma_atr = tr_series.rolling(window=14).mean()
-        
-        # 从第14个值开始使用EMA平滑
-        atr = sma_atr.copy()
-        for i in range(14, len(tr_series)):
-            atr.iloc[i] = (tr_series.iloc[i] + (14-1) * atr.iloc[i-1]) / 14
-        
-        return float(atr.iloc[-1])
+        # Wilder 平滑是一阶 IIR：y[i] = (tr[i] + 13*y[i-1]) / 14，只需要最后一个值
+        sma14 = tr[:14].mean()
+        if len(tr) == 14:
+            return float(sma14)
+
+        if SCIPY_AVAILABLE:
+            tail, _ = lfilter([1.0 / 14.0], [1.0, -13.0 / 14.0], tr[14:],
+                              zi=np.array([sma14 * 13.0 / 14.0]))
+            return float(tail[-1])
+
+        # 无 scipy 时退回标量递推（仍避免逐元素 iloc 赋值）
+        atr = sma14
+        for x in tr[14:]:
+            atr = (x + 13.0 * atr) / 14.0
+        return float(atr)
 ATR_CALCULATOR = AverageTrueRangeCalculator()
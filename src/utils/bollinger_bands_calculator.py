@@ -7,6 +7,48 @@ import pandas as pd
 import numpy as np
 from typing import Union, Tuple, Optional
 from .calculator_interface import BaseTechnicalCalculator
+from ._njit import njit
+
+
+@njit(cache=True)
+def _boll_last(prices: np.ndarray, window: int, num_std: float) -> Tuple[float, float, float]:
+    """单趟滑动 sum/sum² 同时出均值与标准差，只算最终会被消费的末值
+
+    语义对齐 rolling(window, min_periods=1) 的 mean/std(ddof=1)：
+    不足两个点时 std 为 NaN，带宽为 0 时按原实现替换为 1。
+    """
+    n = prices.shape[0]
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        p = prices[i]
+        s += p
+        s2 += p * p
+        if i >= window:
+            q = prices[i - window]
+            s -= q
+            s2 -= q * q
+    w = window if n > window else n
+    mean = s / w
+    if w > 1:
+        var = (s2 - s * s / w) / (w - 1)
+        if var < 0.0:
+            var = 0.0
+        std = np.sqrt(var)
+    else:
+        std = np.nan
+    upper = mean + num_std * std
+    lower = mean - num_std * std
+    band_width = upper - lower
+    if band_width == 0.0:
+        band_width = 1.0
+    position = (prices[n - 1] - lower) / band_width
+    # NaN 两个比较都不成立，原样穿透 clip
+    if position < 0.0:
+        position = 0.0
+    elif position > 1.0:
+        position = 1.0
+    return upper, lower, position
 
 
 class BollingerBandsCalculator(BaseTechnicalCalculator):
@@ -41,42 +83,27 @@ class BollingerBandsCalculator(BaseTechnicalCalculator):
             - bollinger_lower: Latest lower band value (布林带下轨)
             - bollinger_position: Latest position (0-1 range, 布林带位置)
         """
-        prices_series = self._convert_to_series(close_prices)
-        
-        # Calculate middle band (moving average)
-        middle_band = prices_series.rolling(window=self.window, min_periods=1).mean()
-        
-        # Calculate standard deviation
-        std_dev = prices_series.rolling(window=self.window, min_periods=1).std()
-        
-        # Calculate upper and lower bands
-        upper_band = middle_band + (std_dev * self.num_std)
-        lower_band = middle_band - (std_dev * self.num_std)
-        
-        # Calculate position (0-1 scale)
-        band_width = upper_band - lower_band
-        
-        # 避免除零导致的 inf/NaN
-        band_width = band_width.replace(0, 1)  # 如果带宽为0，用1替代
-        
-        position = (prices_series - lower_band) / band_width
-        
-        # Handle invalid values and clip to [0, 1]
-        position = position.replace([np.inf, -np.inf], np.nan)
-        position = position.clip(0, 1)
-        
-        # Fill NaN values if requested
+        prices = np.ascontiguousarray(np.asarray(close_prices, dtype=np.float64))
+
+        if prices.size == 0:
+            return np.nan, np.nan, np.nan
+
+        # 末值只依赖最后 window 个点，先切尾再算，复杂度 O(window) 与历史长度无关
+        tail = np.ascontiguousarray(prices[-self.window:])
+
+        # 均值与标准差在一个滑动窗口内核里同时维护，替代两次 rolling 扫描
+        last_upper, last_lower, last_position = _boll_last(tail, self.window, self.num_std)
+
+        # Fill NaN values if requested（NaN 仅出现在样本不足两个点时）
         if self.fillna:
-            upper_band = upper_band.fillna(prices_series)
-            middle_band = middle_band.fillna(prices_series)
-            lower_band = lower_band.fillna(prices_series)
-            position = position.fillna(0.5)
-        
-        # Get latest values
-        last_upper = self._get_last_value(upper_band)
-        last_lower = self._get_last_value(lower_band)
-        last_position = self._get_last_value(position)
-        
+            last_price = float(prices[-1])
+            if np.isnan(last_upper):
+                last_upper = last_price
+            if np.isnan(last_lower):
+                last_lower = last_price
+            if np.isnan(last_position):
+                last_position = 0.5
+
         return last_upper, last_lower, last_position
 
 
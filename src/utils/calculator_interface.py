@@ -85,13 +85,45 @@ class BaseTechnicalCalculator(ABC):
     def _get_last_value(self, series: pd.Series) -> float:
         """
         Safely get the last value from a series
-        
+
         Args:
             series: pandas Series
-            
+
         Returns:
             Last value as float, or NaN if series is empty
         """
         if series.empty:
             return np.nan
-        return float(series.iloc[-1])
\ No newline at end of file
+        return float(series.iloc[-1])
+
+    def _convert_to_array(self, data: SeriesType) -> np.ndarray:
+        """
+        Convert input data to a float64 ndarray
+        热路径数组模式：跳过 pd.Series 构建与 block manager 开销
+
+        Args:
+            data: Input data (Series, list, or numpy array)
+
+        Returns:
+            numpy float64 array (C contiguous, 零拷贝快速路径优先)
+        """
+        # 已是连续 float64 数组时原样返回，零开销；numba 内核也要求连续布局
+        if isinstance(data, np.ndarray) and data.dtype == np.float64 and data.flags.c_contiguous:
+            return data
+        if isinstance(data, pd.Series):
+            data = data.to_numpy()
+        return np.ascontiguousarray(data, dtype=np.float64)
+
+    def _get_last_value_arr(self, arr: np.ndarray) -> float:
+        """
+        Safely get the last value from an ndarray
+
+        Args:
+            arr: numpy array
+
+        Returns:
+            Last value as float, or NaN if array is empty
+        """
+        if arr.size == 0:
+            return np.nan
+        return float(arr[-1])
\ No newline at end of file
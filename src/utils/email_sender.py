@@ -3,18 +3,96 @@ Email sender module for sending trading alerts.
 Handles SMTP email configuration and sending.
 """
 
+import atexit
 import logging
-import smtplib
 from datetime import datetime
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.utils import formataddr
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 from collect.config_handler import config_handler
 
+# smtplib / email.mime.* 延迟到首次发送时导入：训练、回测等从不发邮件的
+# 进程不再为它们付出冷启动成本（见 send_email / _get_connection）
+
 logger = logging.getLogger(__name__)
 
+# 告警邮件 HTML 模板：模块级常量只构建一次，发送时 format_map 填充占位符，
+# 避免每次告警重建多 KB 的 f-string
+_ALERT_HTML_TEMPLATE = """
+<html>
+<head>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+        }}
+        .container {{
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+        }}
+        .header {{
+            background-color: #4CAF50;
+            color: white;
+            padding: 20px;
+            text-align: center;
+            border-radius: 5px 5px 0 0;
+        }}
+        .prediction {{
+            font-size: 24px;
+            font-weight: bold;
+            margin: 20px 0;
+            text-align: center;
+        }}
+        .confidence {{
+            text-align: center;
+            font-size: 18px;
+            color: #4CAF50;
+            margin: 10px 0;
+        }}
+        .details {{
+            background-color: #f9f9f9;
+            padding: 15px;
+            margin: 20px 0;
+            border-radius: 5px;
+        }}
+        .timestamp {{
+            text-align: center;
+            color: #666;
+            font-size: 12px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h2>交易提醒</h2>
+        </div>
+        <div class="prediction">
+            {prediction_label}
+        </div>
+        <div class="confidence">
+            置信度: {confidence:.1%}, 价格: {price:.2f}
+        </div>
+        <div class="details">
+            <h3>结果价预测详情</h3>
+            <p><strong>预测标签:</strong> {prediction} - {prediction_label}</p>
+            <p><strong>置信度:</strong> {confidence:.1%}</p>
+            <h4>所有类别概率:</h4>
+            <ul>
+{prob_list}
+            </ul>
+            <p><strong>最高价:</strong> {prediction_high} - {prediction_high_label} - {confidence_high:.1%}</p>
+            <p><strong>最低价:</strong> {prediction_low} - {prediction_low_label} - {confidence_low:.1%}</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
 
 class EmailSender:
     """Email sender for trading alerts."""
@@ -27,10 +105,44 @@ class EmailSender:
             smtp_item: Configuration item for SMTP settings (default: "smtp.qq.com")
         """
         self.smtp_item = smtp_item
-        self.smtp_config = config_handler.get_config_dict(smtp_item)
-        
-        if not self.smtp_config:
-            logger.warning(f"No SMTP configuration found for {smtp_item}")
+        # 配置延迟到首次发送时读取并缓存：构造本身不打 MongoDB
+        self.smtp_config = None
+        # 跨发送复用的 SMTP 连接：TLS 握手只做一次，断线时懒重连
+        self._smtp = None
+        # 进程退出时优雅关闭长连接
+        atexit.register(self.close)
+
+    def _get_connection(self, host: str, port: int, account: str, auth_code: str) -> "smtplib.SMTP":
+        """
+        Get a logged-in SMTP connection, reusing the cached one when alive.
+
+        Returns:
+            smtplib.SMTP: Connected and authenticated SMTP session
+        """
+        import smtplib
+
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except Exception:
+                # 连接已被服务端断开，丢弃重建
+                self.close()
+
+        server = smtplib.SMTP(host, port, timeout=30)
+        server.starttls()  # Enable TLS
+        server.login(account, auth_code)
+        self._smtp = server
+        return server
+
+    def close(self):
+        """Close the cached SMTP connection if any."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
     
     def get_current_time(self) -> str:
         """
@@ -43,13 +155,19 @@ class EmailSender:
     
     def _get_smtp_config(self) -> Optional[Dict[str, str]]:
         """
-        Get SMTP configuration from MongoDB.
-        
+        Get SMTP configuration, fetching and caching it on first use.
+
+        配置在首次发送时读取一次并缓存，之后不再为每封邮件做 MongoDB 往返；
+        取到空配置时不缓存，下次发送会再回源重试。
+
         Returns:
             Dictionary with 'account', 'authCode', 'host', 'port' or None
         """
-        config = config_handler.get_config_dict(self.smtp_item)
-        
+        config = self.smtp_config
+        if not config:
+            config = config_handler.get_config_dict(self.smtp_item)
+            self.smtp_config = config
+
         if not config:
             logger.error(f"SMTP configuration not found: {self.smtp_item}")
             return None
@@ -83,6 +201,12 @@ class EmailSender:
         Returns:
             bool: True if send successful, False otherwise
         """
+        # 首次发送时才加载 smtplib / email.mime.*，模块缓存保证稳态零开销
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        from email.utils import formataddr
+
         try:
             smtp_config = self._get_smtp_config()
             if not smtp_config:
@@ -102,11 +226,12 @@ class EmailSender:
             # Attach content
             msg.attach(MIMEText(content, 'html' if is_html else 'plain', 'utf-8'))
             
-            # Send email
-            with smtplib.SMTP(host, port) as server:
-                server.starttls()  # Enable TLS
-                server.login(account, auth_code)
-                server.send_message(msg)
+            # Send email（复用长连接，失效时重建一次再试）
+            try:
+                self._get_connection(host, port, account, auth_code).send_message(msg)
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPException):
+                self.close()
+                self._get_connection(host, port, account, auth_code).send_message(msg)
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -155,95 +280,34 @@ class EmailSender:
             
             # Format timestamp
             if timestamp:
-                from datetime import datetime
                 dt = datetime.fromtimestamp(timestamp / 1000)
                 formatted_time = dt.strftime('%Y-%m-%d %H:%M:%S')
             else:
                 formatted_time = "Unknown"
-            
+
             # Create email content (HTML format)
             subject = f"交易提醒: {prediction_label} (置信度: {confidence:.2%})"
-            
-            html_content = f"""
-            <html>
-            <head>
-                <style>
-                    body {{
-                        font-family: Arial, sans-serif;
-                        line-height: 1.6;
-                        color: #333;
-                    }}
-                    .container {{
-                        max-width: 600px;
-                        margin: 0 auto;
-                        padding: 20px;
-                        border: 1px solid #ddd;
-                        border-radius: 5px;
-                    }}
-                    .header {{
-                        background-color: #4CAF50;
-                        color: white;
-                        padding: 20px;
-                        text-align: center;
-                        border-radius: 5px 5px 0 0;
-                    }}
-                    .prediction {{
-                        font-size: 24px;
-                        font-weight: bold;
-                        margin: 20px 0;
-                        text-align: center;
-                    }}
-                    .confidence {{
-                        text-align: center;
-                        font-size: 18px;
-                        color: #4CAF50;
-                        margin: 10px 0;
-                    }}
-                    .details {{
-                        background-color: #f9f9f9;
-                        padding: 15px;
-                        margin: 20px 0;
-                        border-radius: 5px;
-                    }}
-                    .timestamp {{
-                        text-align: center;
-                        color: #666;
-                        font-size: 12px;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h2>交易提醒</h2>
-                    </div>
-                    <div class="prediction">
-                        {prediction_label}
-                    </div>
-                    <div class="confidence">
-                        置信度: {confidence:.1%}, 价格: {price:.2f}
-                    </div>
-                    <div class="details">
-                        <h3>结果价预测详情</h3>
-                        <p><strong>预测标签:</strong> {prediction} - {prediction_label}</p>
-                        <p><strong>置信度:</strong> {confidence:.1%}</p>
-                        <h4>所有类别概率:</h4>
-                        <ul>
-            """
-            
-            for class_id, prob in probabilities.items():
-                html_content += f"<li>类别 {class_id}: {prob:.1%}</li>"
-            
-            html_content += f"""
-                        </ul>
-                        <p><strong>最高价:</strong> {prediction_high} - {prediction_high_label} - {confidence_high:.1%}</p>
-                        <p><strong>最低价:</strong> {prediction_low} - {prediction_low_label} - {confidence_low:.1%}</p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            
+
+            # 概率列表一次 join 构建，再用模板 format_map 填充，避免循环内字符串拼接
+            prob_list = "".join(
+                f"<li>类别 {class_id}: {prob:.1%}</li>"
+                for class_id, prob in probabilities.items()
+            )
+            html_content = _ALERT_HTML_TEMPLATE.format_map({
+                'prediction': prediction,
+                'prediction_label': prediction_label,
+                'confidence': confidence,
+                'price': price,
+                'prob_list': prob_list,
+                'prediction_high': prediction_high,
+                'prediction_high_label': prediction_high_label,
+                'confidence_high': confidence_high,
+                'prediction_low': prediction_low,
+                'prediction_low_label': prediction_low_label,
+                'confidence_low': confidence_low,
+                'formatted_time': formatted_time,
+            })
+
             # Send email
             return self.send_email(to_email, subject, html_content, is_html=True)
             
@@ -252,5 +316,15 @@ class EmailSender:
             return False
 
 
-# Global instance
-email_sender = EmailSender()
+# Global instance, built lazily on first access
+@lru_cache(maxsize=1)
+def get_email_sender() -> EmailSender:
+    """Return the process-wide EmailSender, constructing it on first call."""
+    return EmailSender()
+
+
+def __getattr__(name):
+    # 兼容既有的 `from utils.email_sender import email_sender` 用法（PEP 562）
+    if name == 'email_sender':
+        return get_email_sender()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
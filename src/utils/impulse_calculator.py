@@ -6,8 +6,8 @@ from typing import Union
 from .calculator_interface import BaseTechnicalCalculator
 
 class ImpulseCalculator(BaseTechnicalCalculator):
-   
-    def calculate(self, volume_series: Union[pd.Series, list, np.ndarray]) -> pd.Series:
+
+    def calculate(self, volume_series: Union[pd.Series, list, np.ndarray]) -> float:
         """
         计算成交量脉冲指标
         Volume Impulse Indicator (VIM) 成交量脉冲指标
@@ -18,21 +18,29 @@ class ImpulseCalculator(BaseTechnicalCalculator):
         20-30周期能在保持敏感性的同时提供足够的基准参考
         Args:
             volume_series: 成交量时间序列
-        
+
         Returns:
             volume_impulse: 成交量相对于近期平均水平的倍数
         """
-        # 计算近期平均成交量
-        # 使用shift(1)将平均值序列向前错位一天，解决了当前成交量与平均成交量计算时的对齐问题
-        # 比如窗口为7 [1,1,1,1,1,1,1,2]  这个2应该是2.0，如果使用shift(1)前的计算方式会是1.78
-        avg_volume = volume_series.rolling(window=20, min_periods=1).mean().shift(1)
-        
+        # 末值只依赖最近 21 个点：尾部切片 + 一次 np.mean，
+        # 不再对整段历史构建 rolling/shift 序列
+        volume = self._convert_to_array(volume_series)
+
+        # 单点无基准可比，视为无脉冲
+        if volume.size < 2:
+            return 1.0
+
+        # 基准 = 末值之前最多 20 个点的均值（等价 rolling(20, min_periods=1).mean().shift(1)）
+        # 排除当前值本身，避免当前成交量与平均成交量计算时的对齐问题
+        # 比如窗口为7 [1,1,1,1,1,1,1,2]  这个2应该是2.0，如果计入当前值会是1.78
+        tail = volume[max(0, volume.size - 21):-1]
+        avg_volume = tail.mean()
+
         # 避免除零导致的 NaN
-        avg_volume = avg_volume.replace(0, 1)  # 如果平均成交量为0，用1替代
-        
+        if avg_volume == 0:
+            avg_volume = 1.0
+
         # 计算成交量脉冲（当前成交量相对平均值的比例）
-        volume_impulse = volume_series / avg_volume
-        
-        return self._get_last_value(volume_impulse)
-    
+        return float(volume[-1] / avg_volume)
+
 IMPULSE_CALCULATOR = ImpulseCalculator()
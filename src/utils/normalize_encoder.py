@@ -5,41 +5,69 @@ Implements rolling window normalization with consistent interface
 
 import pandas as pd
 import numpy as np
-from typing import Union
+from typing import Tuple, Union
 from .calculator_interface import BaseTechnicalCalculator
 
 
 class Normalized(BaseTechnicalCalculator):
     """Rolling window normalization calculator with standardized interface"""
-    
-    def calculate(self, close_prices: Union[pd.Series, list, np.ndarray]) -> pd.Series:
+
+    def __init__(self):
+        # Welford 增量统计量：流式逐点喂入时追加一个点是 O(1)，
+        # 不必像 calculate 那样每根新 K 线重扫全序列
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the streaming Welford state."""
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._last = np.nan
+
+    def update(self, x_new: float) -> None:
+        """
+        Feed one new observation into the streaming statistics (O(1)).
+
+        Args:
+            x_new: Latest price observation
+        """
+        self._n += 1
+        delta = x_new - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (x_new - self._mean)
+        self._last = x_new
+
+    @property
+    def last_z(self) -> float:
+        """最近一次 update 值相对已喂入序列的 z 分数（与 calculate 同语义）"""
+        if self._n < 2:
+            return 0.0
+        std = np.sqrt(self._m2 / (self._n - 1))
+        return float((self._last - self._mean) / std) if std > 0 else 0.0
+
+    def calculate(self, close_prices: Union[pd.Series, list, np.ndarray]) -> Tuple[float, float, float]:
         """
-        Calculate normalized price values using rolling window
-        
-        Note: For window=N, only indices N-1 and beyond contain accurate normalized values
-        Indices 0 to N-2 will have incomplete window calculations
-        
+        Calculate the normalized (z-score) value of the last price
+
+        末值 z 分数只需整体均值与标准差两个标量，直接在 ndarray 上
+        一次归约，不再构建任何 pandas 序列
+
         Args:
             close_prices: Closing prices series
-            
+
         Returns:
-            pandas Series with normalized values
+            Tuple of (last_z_score, mean, std)
         """
-        # Convert to pandas Series if needed
-        prices_series = self._convert_to_series(close_prices)
-        
-        # Calculate rolling statistics
-        # window = len(prices_series)
-        # rolling_mean = prices_series.rolling(window=window, min_periods=1).mean()
-        # rolling_std = prices_series.rolling(window=window, min_periods=1).std()
-        
-        # 优化性能，直接计算整体均值和标准差，而不是滚动窗口
-        rolling_mean = prices_series.mean()
-        rolling_std = prices_series.std()
-        
-        # Normalize prices
-        normalized = (prices_series - rolling_mean) / rolling_std
-        
-        return self._get_last_value(normalized), self._get_last_value(rolling_mean), self._get_last_value(rolling_std)
+        prices = self._convert_to_array(close_prices)
+        if prices.size == 0:
+            return 0.0, np.nan, np.nan
+
+        mean = float(prices.mean())
+        # ddof=1 与 pandas Series.std() 一致；单点样本无方差
+        std = float(prices.std(ddof=1)) if prices.size > 1 else np.nan
+
+        # 零波动 / 无方差时 z 分数退化为 0
+        z_score = float((prices[-1] - mean) / std) if std > 0 else 0.0
+        return z_score, mean, std
 
 NORMALIZED = Normalized()
@@ -61,18 +61,19 @@ class PinbarCalculator(BaseTechnicalCalculator):
             2 长下影线 多头力量强，可能上涨 
             3 长上下影线 多空分歧大，市场犹豫
         """
-        high_series = self._convert_to_series(high_prices)
-        low_series = self._convert_to_series(low_prices)
-        open_series = self._convert_to_series(open_prices)
-        close_series = self._convert_to_series(close_prices)
-        
-        if high_series.empty or low_series.empty or open_series.empty or close_series.empty:
+        # 只消费末值，数组模式取尾即可，不经过 pd.Series
+        high_arr = self._convert_to_array(high_prices)
+        low_arr = self._convert_to_array(low_prices)
+        open_arr = self._convert_to_array(open_prices)
+        close_arr = self._convert_to_array(close_prices)
+
+        if high_arr.size == 0 or low_arr.size == 0 or open_arr.size == 0 or close_arr.size == 0:
             return self._get_empty_result()
-        
-        high = self._get_last_value(high_series)
-        low = self._get_last_value(low_series)
-        open_price = self._get_last_value(open_series)
-        close_price = self._get_last_value(close_series)
+
+        high = self._get_last_value_arr(high_arr)
+        low = self._get_last_value_arr(low_arr)
+        open_price = self._get_last_value_arr(open_arr)
+        close_price = self._get_last_value_arr(close_arr)
         
         range_price = high - low
         
@@ -93,12 +94,7 @@ class PinbarCalculator(BaseTechnicalCalculator):
         is_long_lower_shadow = lower_shadow > body_height * self.long_shadow_threshold
         is_doji = body_height < range_price * self.doji_threshold
         
-        shadow_type = self._get_shadow_type(
-            is_long_upper_shadow, 
-            is_long_lower_shadow,
-            upper_shadow,
-            lower_shadow
-        )
+        shadow_type = self._get_shadow_type(is_long_upper_shadow, is_long_lower_shadow)
         
         return {
             'upper_shadow': upper_shadow,
@@ -114,16 +110,13 @@ class PinbarCalculator(BaseTechnicalCalculator):
             'shadow_type': shadow_type
         }
     
-    def _get_shadow_type(self, is_long_upper: bool, is_long_lower: bool, upper: float, lower: float) -> int:
-        """Determine shadow type"""
-        if is_long_upper and not is_long_lower:
-            return 1
-        elif is_long_lower and not is_long_upper:
-            return 2
-        elif is_long_upper and is_long_lower:
-            return 3
-        else:
-            return 0
+    def _get_shadow_type(self, is_long_upper: bool, is_long_lower: bool) -> int:
+        """Determine shadow type
+
+        两个布尔位直接编码为 0/1/2/3（上影=bit0，下影=bit1），
+        无分支，与原 if/elif 映射完全一致
+        """
+        return int(is_long_upper) + 2 * int(is_long_lower)
     
     def _get_empty_result(self) -> dict:
         """Return empty result for invalid data"""
@@ -11,7 +11,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
-from utils.adx_calculator import ADX_CALCULATOR
+from utils.adx_calculator import ADX_CALCULATOR, _adx_kernel
 
 
 class TestADXCalculator:
@@ -90,5 +90,67 @@ class TestADXCalculator:
             assert adx <= expected_dx + 5, "ADX should be close to smoothed DX"
 
 
+class TestAdxKernel:
+    """_adx_kernel 单趟融合内核与教科书式分步实现的数值对比"""
+
+    @staticmethod
+    def _reference(high, low, close, window):
+        """按标准定义分步计算：TR/DM → Wilder 平滑 → DX → ADX"""
+        n = len(high)
+        tr = [high[0] - low[0]]
+        plus_dm = [0.0]
+        minus_dm = [0.0]
+        for i in range(1, n):
+            tr.append(max(high[i] - low[i],
+                          abs(high[i] - close[i - 1]),
+                          abs(low[i] - close[i - 1])))
+            up = high[i] - high[i - 1]
+            down = low[i - 1] - low[i]
+            plus_dm.append(up if up > down and up > 0 else 0.0)
+            minus_dm.append(down if down > up and down > 0 else 0.0)
+
+        tr_s = sum(tr[:window])
+        plus_s = sum(plus_dm[:window])
+        minus_s = sum(minus_dm[:window])
+        dx_values = []
+        plus_di = minus_di = 0.0
+        for i in range(window - 1, n):
+            if i >= window:
+                tr_s = tr_s - tr_s / window + tr[i]
+                plus_s = plus_s - plus_s / window + plus_dm[i]
+                minus_s = minus_s - minus_s / window + minus_dm[i]
+            denom = tr_s if tr_s else 1.0
+            plus_di = 100.0 * plus_s / denom
+            minus_di = 100.0 * minus_s / denom
+            di_sum = (plus_di + minus_di) or 1.0
+            dx_values.append(100.0 * abs(plus_di - minus_di) / di_sum)
+
+        adx = sum(dx_values[:window]) / min(window, len(dx_values))
+        for dx in dx_values[window:]:
+            adx = (adx * (window - 1) + dx) / window
+        return adx, plus_di, minus_di
+
+    def test_kernel_matches_stepwise_reference(self):
+        rng = np.random.default_rng(42)
+        close = 100 + np.cumsum(rng.normal(0, 1, 80))
+        high = close + rng.uniform(0.1, 2.0, 80)
+        low = close - rng.uniform(0.1, 2.0, 80)
+
+        adx, plus_di, minus_di = _adx_kernel(high, low, close, 14)
+        ref_adx, ref_plus, ref_minus = self._reference(high, low, close, 14)
+
+        assert adx == pytest.approx(ref_adx, abs=1e-9)
+        assert plus_di == pytest.approx(ref_plus, abs=1e-9)
+        assert minus_di == pytest.approx(ref_minus, abs=1e-9)
+
+    def test_flat_market_zero_guards(self):
+        # 全平序列 TR 与 DM 均为 0，除零保护下输出应为有限的 0
+        flat = np.full(40, 100.0)
+        adx, plus_di, minus_di = _adx_kernel(flat, flat, flat, 14)
+        assert adx == 0.0
+        assert plus_di == 0.0
+        assert minus_di == 0.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -11,7 +11,7 @@ import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
-from utils.bollinger_bands_calculator import BollingerBandsCalculator, BOLLINGER_BANDS_20
+from utils.bollinger_bands_calculator import BollingerBandsCalculator, BOLLINGER_BANDS_20, _boll_last
 
 
 class TestBollingerBandsCalculator:
@@ -122,6 +122,50 @@ class TestBollingerBandsCalculator:
         assert not np.isnan(position_no_fill), "Non-filled position should not be NaN"
 
 
+class TestBollLastKernel:
+    """_boll_last 滑动 sum/sum² 内核与 pandas rolling 的数值对比"""
+
+    def test_kernel_matches_pandas_rolling(self):
+        rng = np.random.default_rng(42)
+        prices = 100 + np.cumsum(rng.normal(0, 1, 60))
+        window, num_std = 20, 2.0
+
+        upper, lower, position = _boll_last(np.ascontiguousarray(prices[-window:]), window, num_std)
+
+        series = pd.Series(prices)
+        mean = series.rolling(window, min_periods=1).mean().iloc[-1]
+        std = series.rolling(window, min_periods=1).std().iloc[-1]
+        ref_upper = mean + num_std * std
+        ref_lower = mean - num_std * std
+        ref_position = np.clip((prices[-1] - ref_lower) / (ref_upper - ref_lower), 0, 1)
+
+        assert upper == pytest.approx(ref_upper, abs=1e-9)
+        assert lower == pytest.approx(ref_lower, abs=1e-9)
+        assert position == pytest.approx(ref_position, abs=1e-9)
+
+    def test_short_series_uses_available_points(self):
+        # 不足 window 个点时等价 rolling(window, min_periods=1)
+        prices = np.array([100.0, 102.0, 104.0, 106.0])
+        upper, lower, position = _boll_last(prices, 20, 2.0)
+
+        mean = prices.mean()
+        std = prices.std(ddof=1)
+        assert upper == pytest.approx(mean + 2.0 * std, abs=1e-9)
+        assert lower == pytest.approx(mean - 2.0 * std, abs=1e-9)
+
+    def test_single_point_std_is_nan(self):
+        upper, lower, position = _boll_last(np.array([100.0]), 20, 2.0)
+        assert np.isnan(upper), "Single-point std is undefined (ddof=1)"
+        assert np.isnan(lower), "Single-point std is undefined (ddof=1)"
+
+    def test_zero_width_band_guard(self):
+        # 常数序列带宽为 0，按原实现以 1 替换，位置 = price - lower = 0
+        prices = np.full(20, 100.0)
+        upper, lower, position = _boll_last(prices, 20, 2.0)
+        assert upper == pytest.approx(lower, abs=1e-12)
+        assert position == 0.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
     
@@ -6,12 +6,13 @@ Test MACD calculation accuracy and edge cases
 import sys
 from pathlib import Path
 import numpy as np
+import pandas as pd
 import pytest
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
-from utils.macd_calculator import MACD_CALCULATOR
+from utils.macd_calculator import MACD_CALCULATOR, MACDCalculator, _macd_last
 
 
 class TestMACDCalculator:
@@ -30,7 +31,49 @@ class TestMACDCalculator:
         upward_trend = np.linspace(100, 250, 50)
         last_macd, last_signal, last_histogram = MACD_CALCULATOR.calculate(upward_trend)
         assert True, "MACD calculation should produce valid results"
-        
+
+
+class TestMacdLastKernel:
+    """_macd_last 融合递推内核与 pandas ewm 链的数值对比"""
+
+    @staticmethod
+    def _pandas_reference(prices, fast, slow, signal):
+        close = pd.Series(prices)
+        ema_fast = close.ewm(span=fast, adjust=False).mean()
+        ema_slow = close.ewm(span=slow, adjust=False).mean()
+        macd = ema_fast - ema_slow
+        sig = macd.ewm(span=signal, adjust=False).mean()
+        return float(macd.iloc[-1]), float(sig.iloc[-1]), float((macd - sig).iloc[-1])
+
+    def test_kernel_matches_pandas_ewm_chain(self):
+        rng = np.random.default_rng(42)
+        prices = 100 + np.cumsum(rng.normal(0, 1, 120))
+        macd, signal, histogram = _macd_last(prices, 2.0 / 13.0, 2.0 / 49.0, 2.0 / 10.0)
+        ref_macd, ref_signal, ref_hist = self._pandas_reference(prices, 12, 48, 9)
+        assert macd == pytest.approx(ref_macd, abs=1e-9)
+        assert signal == pytest.approx(ref_signal, abs=1e-9)
+        assert histogram == pytest.approx(ref_hist, abs=1e-9)
+
+    def test_first_macd_is_zero(self):
+        # 两条 EMA 均以首值为种子，单点输入 MACD 恒为 0
+        macd, signal, histogram = _macd_last(np.array([123.4]), 2.0 / 13.0, 2.0 / 49.0, 2.0 / 10.0)
+        assert macd == 0.0
+        assert signal == 0.0
+        assert histogram == 0.0
+
+    def test_long_history_truncation_stays_accurate(self):
+        # 截尾到 8 倍慢线窗口后的相对误差应 ≲ 1e-6
+        rng = np.random.default_rng(1)
+        prices = 100 + np.cumsum(rng.normal(0, 1, 5000))
+        calc = MACDCalculator()
+        macd, signal, histogram = calc.calculate(prices)
+        ref_macd, ref_signal, ref_hist = self._pandas_reference(
+            prices, calc.fast_window, calc.slow_window, calc.signal_window)
+        scale = max(1.0, abs(ref_macd))
+        assert abs(macd - ref_macd) / scale < 1e-6
+        assert abs(signal - ref_signal) / max(1.0, abs(ref_signal)) < 1e-6
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+FeatureDatasetBuilder Unit Tests
+Test train/predict feature parity and cache behaviour
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from feature.feature_engineering import FeatureDatasetBuilder
+
+
+def _make_candles(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return [
+        {
+            'timestamp': i * 3600,
+            'open': float(close[i] - 0.1),
+            'high': float(close[i] + abs(rng.normal(0, 0.5))),
+            'low': float(close[i] - abs(rng.normal(0, 0.5))),
+            'close': float(close[i]),
+            'volume': float(rng.uniform(10, 100)),
+        }
+        for i in range(n)
+    ]
+
+
+class TestTrainPredictParity:
+    """训练样本与预测路径在同一窗口上必须产出一致的特征"""
+
+    def test_training_rows_match_prediction_features(self):
+        n = 400
+        stride = 25
+        horizon = 24
+        data = _make_candles(n)
+
+        builder = FeatureDatasetBuilder()
+        X, y = builder.create_training_dataset(data, stride=stride, prediction_horizon=horizon)
+
+        window = builder.feature_window_size
+        starts = range(0, n - window - horizon + 1, stride)
+        assert len(X) == len(starts), "Sample count should match the sliding starts"
+
+        ind_cols = [f'{w}_{k}' for w in builder.tech_calculator.windows
+                    for k in builder.INDICATOR_KEYS]
+        for si, s in enumerate(starts):
+            pred = builder.prepare_prediction_features(data[:s + window])
+            for col in X.columns:
+                train_val = float(X[col].iloc[si])
+                pred_val = float(pred[col].iloc[0])
+                if np.isnan(train_val) and np.isnan(pred_val):
+                    continue
+                # 指标列是训练/预测偏差的高危区，容差只留 float32 舍入；
+                # 其余列（如 raw_price_std 的 sum-of-squares）放宽到 1e-3
+                rtol = 1e-5 if col in ind_cols else 1e-3
+                assert train_val == pytest.approx(pred_val, rel=rtol, abs=1e-4), \
+                    f"sample {si} column {col}: train={train_val} predict={pred_val}"
+
+    def test_window_indicator_columns_differ_across_windows(self):
+        # EMA 类指标以各窗口起点为种子，短/中窗口的 MACD 列不应整列相同
+        data = _make_candles(400)
+        builder = FeatureDatasetBuilder()
+        X, _ = builder.create_training_dataset(data, stride=25, prediction_horizon=24)
+
+        assert not np.array_equal(X['short_macd_line'].values, X['medium_macd_line'].values), \
+            "short/medium MACD columns should not be identical full-series values"
+        assert not np.array_equal(X['medium_macd_line'].values, X['long_macd_line'].values), \
+            "medium/long MACD columns should not be identical full-series values"
+
+
+class TestPredictionCache:
+    """预测特征缓存：快照不变时命中，未收盘 K 线价量跳动时失效"""
+
+    def test_forming_candle_update_invalidates_cache(self):
+        data = _make_candles(320)
+        builder = FeatureDatasetBuilder()
+
+        before = builder.prepare_prediction_features(data)
+        # 同一 timestamp 下收盘价跳动，必须重算
+        data[-1]['close'] += 5.0
+        after = builder.prepare_prediction_features(data)
+        assert float(before['current_price'].iloc[0]) != float(after['current_price'].iloc[0]), \
+            "Cache should be invalidated when the forming candle's close changes"
+
+    def test_unchanged_snapshot_hits_cache(self):
+        data = _make_candles(320)
+        builder = FeatureDatasetBuilder()
+
+        first = builder.prepare_prediction_features(data)
+        second = builder.prepare_prediction_features(data)
+        assert first.equals(second), "Identical snapshots should reuse the cached features"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,50 @@
+"""
+PredictionScheduler Unit Tests
+Test the alert decision against the original inline condition
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from schedule.prediction_scheduler import PredictionScheduler
+
+
+def _legacy_should_alert(prediction_data: dict) -> bool:
+    """提取 _should_alert 之前告警路径上的内联条件，作为平价基准"""
+    return (prediction_data.get('prediction') != 3
+            and prediction_data.get('probabilities').get(prediction_data.get('prediction')) > 0.75)
+
+
+class TestShouldAlert:
+    """Test suite for PredictionScheduler._should_alert"""
+
+    def test_parity_with_legacy_inline_condition(self):
+        # 覆盖 全类别 × 阈值两侧/边界 的组合
+        for prediction in (1, 2, 3, 4, 5):
+            for probability in (0.0, 0.5, 0.75, 0.7500001, 0.8, 1.0):
+                prediction_data = {
+                    'prediction': prediction,
+                    'probabilities': {prediction: probability},
+                }
+                assert PredictionScheduler._should_alert(prediction_data) == \
+                    _legacy_should_alert(prediction_data), \
+                    f"prediction={prediction} probability={probability}"
+
+    def test_neutral_class_never_alerts(self):
+        prediction_data = {'prediction': 3, 'probabilities': {3: 0.99}}
+        assert PredictionScheduler._should_alert(prediction_data) is False
+
+    def test_confident_directional_prediction_alerts(self):
+        prediction_data = {'prediction': 5, 'probabilities': {5: 0.80}}
+        assert PredictionScheduler._should_alert(prediction_data) is True
+
+    def test_threshold_is_exclusive(self):
+        prediction_data = {'prediction': 1, 'probabilities': {1: 0.75}}
+        assert PredictionScheduler._should_alert(prediction_data) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])